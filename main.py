@@ -7,23 +7,49 @@ for RAW image processing with metadata parsing and parameter controls.
 
 import sys
 import re
+import copy
+import threading
 import struct
+import functools
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, NamedTuple
 import numpy as np
 
+try:
+    import numba
+except ImportError:
+    numba = None
+else:
+    # TBB, numba's first pick when installed, hangs at interpreter exit once a
+    # parallel kernel has run on a non-main thread, which the load and render
+    # workers do. Pin workqueue unless NUMBA_THREADING_LAYER chose a layer.
+    if numba.config.THREADING_LAYER == 'default':
+        numba.config.THREADING_LAYER = 'workqueue'
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+try:
+    import rawpy
+except ImportError:
+    rawpy = None
+
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QTextEdit, QFileDialog, QFrame, QSizePolicy,
     QDoubleSpinBox, QSpinBox, QComboBox, QSlider, QScrollArea,
-    QGroupBox, QGridLayout, QLineEdit, QCheckBox
+    QGroupBox, QGridLayout, QLineEdit, QCheckBox, QStackedWidget
+)
+from PyQt6.QtGui import (
+    QPixmap, QPixmapCache, QImage, QColor, QPalette, QPainter, QShortcut, QKeySequence
 )
-from PyQt6.QtGui import QPixmap, QImage, QColor, QPalette
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 
 # Slide titles - ISP Pipeline stages
-SLIDE_TITLES = [
+SLIDE_TITLES = (
     "Raw Interpretation",
     "Black Level Correction",
     "Demosaic",
@@ -34,7 +60,47 @@ SLIDE_TITLES = [
     "Gamma Correction",
     "Color Correction",
     "Output Preview"
-]
+)
+
+N_SLIDES = len(SLIDE_TITLES)
+
+# ISPParameters fields each stage reads, indexed like SLIDE_TITLES
+STAGE_PARAM_FIELDS = (
+    ("bayer_pattern",),
+    ("black_level_r", "black_level_gr", "black_level_gb", "black_level_b"),
+    ("demosaic_method", "edge_threshold"),
+    ("wb_r_gain", "wb_g_gain", "wb_b_gain", "auto_wb"),
+    ("lsc_enabled", "lsc_strength", "lsc_center_x", "lsc_center_y"),
+    ("gtm_enabled", "gtm_strength", "gtm_contrast", "lut_file"),
+    ("exposure_ev", "highlight_recovery", "shadow_recovery"),
+    ("gamma_value", "gamma_enabled"),
+    ("saturation", "hue_shift", "ccm_enabled"),
+    (),
+)
+
+# ISPParameters fields that shape the decoded mosaic, so every stage depends on them
+RAW_FORMAT_FIELDS = ("width", "height", "bpp", "packed")
+
+# Every field a stage's output depends on: its own and all earlier stages'
+STAGE_DEPS = tuple(
+    RAW_FORMAT_FIELDS + tuple(name for fields in STAGE_PARAM_FIELDS[:stage + 1] for name in fields)
+    for stage in range(N_SLIDES)
+)
+
+# ISPParameters field -> first stage whose output it changes
+FIELD_STAGE = {name: stage for stage in reversed(range(N_SLIDES)) for name in STAGE_DEPS[stage]}
+
+# Last stage of the cached front of the pipeline (raw to white-balanced RGB)
+FRONT_LAST_STAGE = 3
+
+# Front-of-pipeline results kept per mosaic
+FRONT_CACHE_ENTRIES = 4
+
+# Decoded mosaics kept for re-opening an unchanged file
+RAW_LOAD_CACHE_ENTRIES = 2
+
+# Precomputed "i of N" counter text per slide
+SLIDE_COUNTERS = tuple(f"{i + 1} of {N_SLIDES}" for i in range(N_SLIDES))
 
 # Bayer pattern types
 BAYER_PATTERNS = {
@@ -44,7 +110,52 @@ BAYER_PATTERNS = {
     3: "BGGR"
 }
 
-CLEAN_STYLE = """
+# Bayer pattern name -> BAYER_PATTERNS index
+PATTERN_TO_INDEX = {v: k for k, v in BAYER_PATTERNS.items()}
+
+# Camera RAW containers decoded through rawpy when it is installed; anything
+# else is read as a headerless sensor dump
+RAW_CONTAINER_SUFFIXES = frozenset({'.cr2', '.nef', '.arw', '.dng', '.orf', '.rw2'})
+
+# Bilinear demosaic weights for the sparse green and red/blue planes
+DEMOSAIC_G_KERNEL = ((0, 1, 0),
+                     (1, 4, 1),
+                     (0, 1, 0))
+DEMOSAIC_RB_KERNEL = ((1, 2, 1),
+                      (2, 4, 2),
+                      (1, 2, 1))
+
+# OpenCV bilinear demosaic codes; OpenCV names a pattern by the 2x2 block
+# starting at (1, 1), so an RGGB sensor maps to its BayerBG code
+CV2_BAYER_CODES = {
+    "RGGB": cv2.COLOR_BayerBG2RGB,
+    "GRBG": cv2.COLOR_BayerGB2RGB,
+    "GBRG": cv2.COLOR_BayerGR2RGB,
+    "BGGR": cv2.COLOR_BayerRG2RGB,
+} if cv2 is not None else {}
+
+# Equal-weight channel average used as the saturation pivot
+GRAY_WEIGHTS = np.full(3, 1.0 / 3.0, dtype=np.float32)
+
+# Quiet period before parameter changes trigger a re-render
+REFRESH_DEBOUNCE_MS = 40
+
+# Entries in the gamma lookup table, interpolated linearly between entries. The
+# table is indexed by the square root of the input: x ** (1 / gamma) is infinitely
+# steep at 0, and a uniform grid loses up to a few percent in the deep shadows
+GAMMA_LUT_SIZE = 4096
+
+# Scaled preview pixmap cache budget in KB (50 MB)
+PIXMAP_CACHE_LIMIT_KB = 51200
+
+# Width budget for an uploaded file name in its card; longer names are elided
+FILENAME_ELIDE_PX = 240
+
+# Metadata dumps are small; anything past this is not parsed
+METADATA_MAX_CHARS = 1_000_000
+
+# Widget-class rules
+CLEAN_BASE_STYLE = """
 QMainWindow, QWidget {
     background-color: #ffffff;
     font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
@@ -54,6 +165,98 @@ QLabel {
     color: #1a1a1a;
 }
 
+QPushButton {
+    background-color: #f8f9fa;
+    color: #495057;
+    border: 1px solid #dee2e6;
+    border-radius: 6px;
+    padding: 10px 20px;
+    font-size: 14px;
+    font-weight: 500;
+}
+
+QPushButton:hover {
+    background-color: #e9ecef;
+    border-color: #ced4da;
+}
+
+QPushButton:pressed {
+    background-color: #dee2e6;
+}
+
+QSpinBox, QDoubleSpinBox, QComboBox, QLineEdit {
+    background-color: #ffffff;
+    border: 1px solid #dee2e6;
+    border-radius: 4px;
+    padding: 6px 10px;
+    font-size: 13px;
+    min-width: 100px;
+}
+
+QSpinBox:focus, QDoubleSpinBox:focus, QComboBox:focus, QLineEdit:focus {
+    border-color: #228be6;
+}
+
+QSlider::groove:horizontal {
+    height: 6px;
+    background: #e9ecef;
+    border-radius: 3px;
+}
+
+QSlider::handle:horizontal {
+    background: #228be6;
+    width: 16px;
+    height: 16px;
+    margin: -5px 0;
+    border-radius: 8px;
+}
+
+QSlider::sub-page:horizontal {
+    background: #228be6;
+    border-radius: 3px;
+}
+
+QGroupBox {
+    font-size: 13px;
+    font-weight: 600;
+    color: #495057;
+    border: 1px solid #e9ecef;
+    border-radius: 8px;
+    margin-top: 12px;
+    padding-top: 12px;
+}
+
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 12px;
+    padding: 0 8px;
+}
+
+QScrollArea {
+    border: none;
+    background: transparent;
+}
+
+QCheckBox {
+    font-size: 13px;
+    color: #495057;
+}
+
+QCheckBox::indicator {
+    width: 18px;
+    height: 18px;
+    border-radius: 4px;
+    border: 1px solid #dee2e6;
+}
+
+QCheckBox::indicator:checked {
+    background-color: #228be6;
+    border-color: #228be6;
+}
+"""
+
+# Object-name rules for the main window's widgets
+CLEAN_WINDOW_STYLE = """
 QLabel#appTitle {
     font-size: 20px;
     font-weight: 600;
@@ -91,6 +294,10 @@ QLabel#sectionLabel {
     letter-spacing: 1px;
 }
 
+QLabel#sectionLabel[header="true"] {
+    margin-top: 8px;
+}
+
 QLabel#paramLabel {
     font-size: 13px;
     color: #495057;
@@ -108,6 +315,10 @@ QLabel#fileName {
     color: #495057;
 }
 
+QLabel#fileName[selected="true"] {
+    color: #228be6;
+}
+
 QLabel#metaKey {
     font-size: 12px;
     color: #868e96;
@@ -119,35 +330,27 @@ QLabel#metaValue {
     font-weight: 500;
 }
 
-QPushButton {
-    background-color: #f8f9fa;
+QLabel#stageSummary {
+    font-size: 13px;
     color: #495057;
-    border: 1px solid #dee2e6;
-    border-radius: 6px;
-    padding: 10px 20px;
-    font-size: 14px;
-    font-weight: 500;
-}
-
-QPushButton:hover {
-    background-color: #e9ecef;
-    border-color: #ced4da;
-}
-
-QPushButton:pressed {
-    background-color: #dee2e6;
+    padding: 12px;
 }
 
 QPushButton#primaryButton {
     background-color: #228be6;
     color: white;
     border: none;
+    padding: 12px 32px;
 }
 
 QPushButton#primaryButton:hover {
     background-color: #1c7ed6;
 }
 
+QPushButton#primaryButton:disabled {
+    background-color: #adb5bd;
+}
+
 QPushButton#applyButton {
     background-color: #40c057;
     color: white;
@@ -176,59 +379,6 @@ QPushButton#navButton:disabled {
     border-color: #e9ecef;
 }
 
-QSpinBox, QDoubleSpinBox, QComboBox, QLineEdit {
-    background-color: #ffffff;
-    border: 1px solid #dee2e6;
-    border-radius: 4px;
-    padding: 6px 10px;
-    font-size: 13px;
-    min-width: 100px;
-}
-
-QSpinBox:focus, QDoubleSpinBox:focus, QComboBox:focus, QLineEdit:focus {
-    border-color: #228be6;
-}
-
-QSlider::groove:horizontal {
-    height: 6px;
-    background: #e9ecef;
-    border-radius: 3px;
-}
-
-QSlider::handle:horizontal {
-    background: #228be6;
-    width: 16px;
-    height: 16px;
-    margin: -5px 0;
-    border-radius: 8px;
-}
-
-QSlider::sub-page:horizontal {
-    background: #228be6;
-    border-radius: 3px;
-}
-
-QGroupBox {
-    font-size: 13px;
-    font-weight: 600;
-    color: #495057;
-    border: 1px solid #e9ecef;
-    border-radius: 8px;
-    margin-top: 12px;
-    padding-top: 12px;
-}
-
-QGroupBox::title {
-    subcontrol-origin: margin;
-    left: 12px;
-    padding: 0 8px;
-}
-
-QScrollArea {
-    border: none;
-    background: transparent;
-}
-
 QFrame#uploadCard {
     background-color: #f8f9fa;
     border: 1px solid #e9ecef;
@@ -244,24 +394,140 @@ QFrame#paramPanel {
     border: 1px solid #e9ecef;
     border-radius: 8px;
 }
+"""
 
-QCheckBox {
-    font-size: 13px;
-    color: #495057;
-}
+# Installed once on the QApplication before any widget is created
+CLEAN_STYLE = CLEAN_BASE_STYLE + CLEAN_WINDOW_STYLE
 
-QCheckBox::indicator {
-    width: 18px;
-    height: 18px;
-    border-radius: 4px;
-    border: 1px solid #dee2e6;
-}
 
-QCheckBox::indicator:checked {
-    background-color: #228be6;
-    border-color: #228be6;
-}
-"""
+# The workqueue threading layer (pinned above) cannot run parallel kernels from
+# several threads at once (GUI thread plus render/load workers); launches take this lock
+NUMBA_LOCK = threading.Lock()
+
+if numba is not None:
+    @numba.njit(cache=True, parallel=True, boundscheck=False)
+    def _unpack_10bit_nb(packed, out, n_groups):
+        """Unpack n_groups 5-byte groups into out in a single fused pass."""
+        for g in numba.prange(n_groups):
+            i = g * 5
+            j = g * 4
+            low = packed[i + 4]
+            out[j] = (np.uint16(packed[i]) << 2) | (low & 0x03)
+            out[j + 1] = (np.uint16(packed[i + 1]) << 2) | ((low >> 2) & 0x03)
+            out[j + 2] = (np.uint16(packed[i + 2]) << 2) | ((low >> 4) & 0x03)
+            out[j + 3] = (np.uint16(packed[i + 3]) << 2) | ((low >> 6) & 0x03)
+    
+    # fastmath without 'nnan': the NaN branches below must not be optimized away
+    NUMBA_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+    
+    @numba.njit(cache=True, inline='always', fastmath=NUMBA_FASTMATH)
+    def _lut_lookup_nb(lut, u):
+        """Read a square-root indexed lut at u in [0, top], interpolating linearly."""
+        top = lut.shape[0] - 1
+        if u > 0.0 and u < top:
+            v = np.sqrt(u * top)
+            j = int(v)
+            return lut[j] + (v - j) * (lut[j + 1] - lut[j])
+        if u >= top:
+            return lut[top]
+        if u <= 0.0:
+            return lut[0]
+        # NaN passes through, as it would through np.power
+        return u
+    
+    @numba.njit(cache=True, parallel=True, fastmath=NUMBA_FASTMATH)
+    def _apply_lut_nb(flat, lut, k, out):
+        """Map flat * k through the square-root indexed lut."""
+        for i in numba.prange(flat.shape[0]):
+            out[i] = _lut_lookup_nb(lut, flat[i] * k)
+    
+    @numba.njit(cache=True, parallel=True, fastmath=NUMBA_FASTMATH)
+    def _lsc_row_max_nb(image, lsc_y, lsc_x, row_max):
+        """Per-row maximum of the RGB image after the separable LSC gain."""
+        for r in numba.prange(image.shape[0]):
+            m = -np.inf
+            for c in range(image.shape[1]):
+                g = lsc_y[r] + lsc_x[c]
+                for ch in range(3):
+                    v = image[r, c, ch] * g
+                    if v > m:
+                        m = v
+            row_max[r] = m
+    
+    @numba.njit(cache=True, fastmath=NUMBA_FASTMATH)
+    def _tone_row_nb(src, dst, lsc_gy, lsc_x3, do_gtm, gtm_scale, gtm_offset, gtm_power,
+                     gtm_norm, ev, hl_threshold, hl_compress, sh_threshold, sh_gain):
+        """LSC gain, GTM and exposure with recovery for one row of samples."""
+        for j in range(src.shape[0]):
+            v = src[j] * (lsc_gy + lsc_x3[j])
+            if do_gtm:
+                v = v * gtm_scale + gtm_offset
+                if gtm_power != 1.0:
+                    if v < 0.0:
+                        v = 0.0
+                    v = v ** gtm_power
+                v *= gtm_norm
+                if v < 0.0:
+                    v = 0.0
+                elif v > gtm_norm:
+                    v = gtm_norm
+            v *= ev
+            if v > hl_threshold:
+                v = hl_threshold + (v - hl_threshold) * hl_compress
+            if v < sh_threshold:
+                v *= sh_gain
+            dst[j] = v
+    
+    @numba.njit(cache=True, fastmath=NUMBA_FASTMATH)
+    def _lut_row_nb(row, lut, k):
+        """Map a row of samples through lut in place."""
+        for j in range(row.shape[0]):
+            row[j] = _lut_lookup_nb(lut, row[j] * k)
+    
+    @numba.njit(cache=True, fastmath=NUMBA_FASTMATH)
+    def _color_row_nb(row, matrix):
+        """Apply the (transposed) colour matrix to a row of packed RGB in place, clamping at 0."""
+        for j in range(0, row.shape[0], 3):
+            p0 = row[j]
+            p1 = row[j + 1]
+            p2 = row[j + 2]
+            for k in range(3):
+                v = p0 * matrix[0, k] + p1 * matrix[1, k] + p2 * matrix[2, k]
+                row[j + k] = 0.0 if v < 0.0 else v
+    
+    @numba.njit(cache=True, parallel=True, fastmath=NUMBA_FASTMATH)
+    def _tonal_chain_nb(image, out, lsc_y, lsc_x3,
+                        do_gtm, gtm_scale, gtm_offset, gtm_power, gtm_norm,
+                        ev, hl_threshold, hl_compress, sh_threshold, sh_gain,
+                        do_gamma, lut, lut_k, do_cc, matrix):
+        """LSC, GTM, exposure, gamma and colour matrix fused into one pass.
+        
+        image and out are (h, w * 3) views of packed RGB and lsc_x3 holds the
+        LSC column term repeated per channel. Rows are the tiles: each row is
+        read once and its later stages run on the output row while it is still
+        in cache. The stages stay in separate row loops so the branch-free ones
+        vectorize; disabled stages are neutral (unit gain, infinite thresholds)
+        or flagged off.
+        """
+        for r in numba.prange(image.shape[0]):
+            _tone_row_nb(image[r], out[r], lsc_y[r], lsc_x3, do_gtm, gtm_scale, gtm_offset,
+                         gtm_power, gtm_norm, ev, hl_threshold, hl_compress,
+                         sh_threshold, sh_gain)
+            if do_gamma:
+                _lut_row_nb(out[r], lut, lut_k)
+            if do_cc:
+                _color_row_nb(out[r], matrix)
+else:
+    _unpack_10bit_nb = None
+    _apply_lut_nb = None
+    _lsc_row_max_nb = None
+    _tonal_chain_nb = None
+
+
+def repolish(widget: QWidget):
+    """Re-apply stylesheet rules after a dynamic property change."""
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
 
 
 @dataclass
@@ -336,6 +602,136 @@ class ISPParameters:
     ccm_enabled: bool = False
 
 
+
+class ParamSpec(NamedTuple):
+    """One row of a stage's parameter panel.
+    
+    kind is "spin", "slider", "check", "combo" (stores the text) or
+    "index_combo" (stores the option index); for combos lo holds the options
+    and for index combos hi maps option text back to its index.
+    "header" and "note" rows only show label and have no key/attr.
+    """
+    kind: str
+    label: str
+    key: str = ""
+    attr: str = ""
+    lo: Any = None
+    hi: Any = None
+
+
+class StageSpec(NamedTuple):
+    """Panel layout and reset values for one pipeline stage."""
+    header: str
+    params: Tuple[ParamSpec, ...]
+    defaults: Dict[str, Any]
+
+
+def _stage_spec(header: str, *params: ParamSpec) -> StageSpec:
+    """Build a StageSpec whose defaults are the ISPParameters defaults of its widgets."""
+    base = ISPParameters()
+    defaults = {p.attr: getattr(base, p.attr) for p in params if p.attr}
+    return StageSpec(header, params, defaults)
+
+
+# Parameter panel per stage, indexed like SLIDE_TITLES
+STAGES = (
+    _stage_spec("RAW FORMAT",
+                ParamSpec("spin", "Width", "width", "width", 1, 10000),
+                ParamSpec("spin", "Height", "height", "height", 1, 10000),
+                ParamSpec("spin", "Bits Per Pixel", "bpp", "bpp", 8, 16),
+                ParamSpec("index_combo", "Bayer Pattern", "bayer_pattern", "bayer_pattern",
+                          tuple(BAYER_PATTERNS.values()), PATTERN_TO_INDEX),
+                ParamSpec("check", "Packed Format", "packed", "packed")),
+    _stage_spec("BLACK LEVEL CORRECTION",
+                ParamSpec("spin", "Black Level R", "bl_r", "black_level_r", 0, 1023),
+                ParamSpec("spin", "Black Level Gr", "bl_gr", "black_level_gr", 0, 1023),
+                ParamSpec("spin", "Black Level Gb", "bl_gb", "black_level_gb", 0, 1023),
+                ParamSpec("spin", "Black Level B", "bl_b", "black_level_b", 0, 1023)),
+    _stage_spec("DEMOSAICING",
+                ParamSpec("combo", "Method", "demosaic_method", "demosaic_method",
+                          ("Bilinear", "VNG", "AHD", "DCB")),
+                ParamSpec("slider", "Edge Threshold", "edge_threshold", "edge_threshold", 0.0, 1.0)),
+    _stage_spec("WHITE BALANCE",
+                ParamSpec("check", "Auto White Balance", "auto_wb", "auto_wb"),
+                ParamSpec("slider", "R Gain", "wb_r", "wb_r_gain", 0.5, 3.0),
+                ParamSpec("slider", "G Gain", "wb_g", "wb_g_gain", 0.5, 3.0),
+                ParamSpec("slider", "B Gain", "wb_b", "wb_b_gain", 0.5, 3.0)),
+    _stage_spec("LENS SHADING CORRECTION",
+                ParamSpec("check", "Enable LSC", "lsc_enabled", "lsc_enabled"),
+                ParamSpec("slider", "Strength", "lsc_strength", "lsc_strength", 0.0, 2.0),
+                ParamSpec("slider", "Center X", "lsc_cx", "lsc_center_x", 0.0, 1.0),
+                ParamSpec("slider", "Center Y", "lsc_cy", "lsc_center_y", 0.0, 1.0)),
+    _stage_spec("GLOBAL TONE MAPPING",
+                ParamSpec("check", "Enable GTM", "gtm_enabled", "gtm_enabled"),
+                ParamSpec("slider", "Strength", "gtm_strength", "gtm_strength", 0.5, 2.0),
+                ParamSpec("slider", "Contrast", "gtm_contrast", "gtm_contrast", 0.5, 2.0),
+                # LUT file selector would go here
+                ParamSpec("header", "LUT")),
+    _stage_spec("EXPOSURE COMPENSATION",
+                ParamSpec("slider", "EV Adjustment", "exposure_ev", "exposure_ev", -3.0, 3.0),
+                ParamSpec("slider", "Highlight Recovery", "highlight_rec", "highlight_recovery", 0.0, 1.0),
+                ParamSpec("slider", "Shadow Recovery", "shadow_rec", "shadow_recovery", 0.0, 1.0)),
+    _stage_spec("GAMMA CORRECTION",
+                ParamSpec("check", "Enable Gamma", "gamma_enabled", "gamma_enabled"),
+                ParamSpec("slider", "Gamma Value", "gamma", "gamma_value", 1.0, 3.0)),
+    _stage_spec("COLOR CORRECTION",
+                ParamSpec("slider", "Saturation", "saturation", "saturation", 0.0, 2.0),
+                ParamSpec("slider", "Hue Shift", "hue_shift", "hue_shift", -1.0, 1.0),
+                ParamSpec("check", "Enable CCM", "ccm_enabled", "ccm_enabled")),
+    _stage_spec("FINAL OUTPUT",
+                # Summary of all applied settings
+                ParamSpec("note", "All ISP stages applied.\nImage ready for export.")),
+)
+
+# Known metadata keys (lowercased, spaces/underscores removed) -> (RawMetadata field, type)
+_META_FIELDS = {
+    'shotmetarevisionver': ('shot_meta_revision_ver', int),
+    'framemetaver': ('frame_meta_ver', int),
+    'framemetarevisionver': ('frame_meta_revision_ver', int),
+    'dumptime': ('dump_time', int),
+    'cameraid': ('camera_id', str),
+    'sensorname': ('sensor_name', str),
+    'productname': ('product_name', str),
+    'devicestate': ('device_state', int),
+    'flashstatus': ('flash_status', int),
+    'bpp': ('bpp', int),
+    'packed': ('packed', int),
+    'bayertype': ('bayer_type', int),
+    'dynamicshotmode': ('dynamic_shot_mode', int),
+}
+
+# Substring rules for keys that only contain a known name, checked in order:
+# (required substrings, excluded substrings, RawMetadata field, type)
+_META_SUBSTRING_RULES = (
+    (('shotmetarevisionver',), (), 'shot_meta_revision_ver', int),
+    (('framemetaver',), ('revision',), 'frame_meta_ver', int),
+    (('framemetarevisionver',), (), 'frame_meta_revision_ver', int),
+    (('dump', 'time'), (), 'dump_time', int),
+    (('cameraid',), (), 'camera_id', str),
+    (('sensorname',), (), 'sensor_name', str),
+    (('productname',), (), 'product_name', str),
+    (('devicestate',), (), 'device_state', int),
+    (('flashstatus',), (), 'flash_status', int),
+    (('bpp',), (), 'bpp', int),
+    (('packed',), (), 'packed', int),
+    (('bayertype',), (), 'bayer_type', int),
+    (('dynamicshotmode',), (), 'dynamic_shot_mode', int),
+)
+
+
+@functools.lru_cache(maxsize=1024)
+def _meta_field(key: str) -> Optional[tuple]:
+    """Resolve a lowercased metadata key to (field, type), or None for extra fields."""
+    known = _META_FIELDS.get(key.replace('_', '').replace(' ', ''))
+    if known is not None:
+        return known
+    for required, excluded, name, conv in _META_SUBSTRING_RULES:
+        if (all(part in key for part in required)
+                and not any(part in key for part in excluded)):
+            return name, conv
+    return None
+
+
 class MetadataParser:
     """Parser for RAW image metadata text files."""
     
@@ -343,47 +739,24 @@ class MetadataParser:
     def parse(content: str) -> RawMetadata:
         metadata = RawMetadata()
         
-        # Clean and split content
-        lines = content.replace(',', '\n').split('\n')
+        # Clean and split content (splitlines also drops the '\r' of CRLF dumps)
+        lines = content.replace(',', '\n').splitlines()
         
         for line in lines:
-            line = line.strip()
-            if not line or ':' not in line:
+            key, sep, value = line.partition(':')
+            if not sep:
                 continue
                 
-            key, value = line.split(':', 1)
             key = key.strip().lower()
             value = value.strip()
             
+            target = _meta_field(key)
+            if target is None:
+                metadata.extra_fields[key] = value
+                continue
+            
             try:
-                if 'shotmetarevisionver' in key:
-                    metadata.shot_meta_revision_ver = int(value)
-                elif 'framemetaver' in key and 'revision' not in key:
-                    metadata.frame_meta_ver = int(value)
-                elif 'framemetarevisionver' in key:
-                    metadata.frame_meta_revision_ver = int(value)
-                elif 'dump' in key and 'time' in key:
-                    metadata.dump_time = int(value)
-                elif 'cameraid' in key:
-                    metadata.camera_id = value
-                elif 'sensorname' in key:
-                    metadata.sensor_name = value
-                elif 'productname' in key:
-                    metadata.product_name = value
-                elif 'devicestate' in key:
-                    metadata.device_state = int(value)
-                elif 'flashstatus' in key:
-                    metadata.flash_status = int(value)
-                elif 'bpp' in key:
-                    metadata.bpp = int(value)
-                elif 'packed' in key:
-                    metadata.packed = int(value)
-                elif 'bayertype' in key:
-                    metadata.bayer_type = int(value)
-                elif 'dynamicshotmode' in key:
-                    metadata.dynamic_shot_mode = int(value)
-                else:
-                    metadata.extra_fields[key] = value
+                setattr(metadata, target[0], target[1](value))
             except ValueError:
                 metadata.extra_fields[key] = value
                 
@@ -396,40 +769,109 @@ class ISPProcessor:
     def __init__(self):
         self.raw_data: Optional[np.ndarray] = None
         self.processed_stages: Dict[int, np.ndarray] = {}
+        # (gamma value, table), swapped as one tuple so worker threads never
+        # see a table paired with the wrong gamma
+        self._gamma_lut: Optional[tuple] = None
+        # (source mosaic, bin factor, binned mosaic) for the display path
+        self._preview: Optional[tuple] = None
+        # (source mosaic, contiguous phase planes) for the most recent mosaic
+        self._phases: Optional[tuple] = None
+        # (source mosaic, {front signature: read-only image}) for the front stages
+        self._front_cache: Optional[tuple] = None
+        # {(path, mtime, size, raw format): (read-only mosaic, pattern)}, swapped whole
+        self._load_cache: Dict[tuple, tuple] = {}
+        # Per-thread scratch arrays reused across preview renders (see _scratch)
+        self._scratch_local = threading.local()
         
     def load_raw(self, file_path: str, params: ISPParameters) -> Optional[np.ndarray]:
         """Load and interpret RAW file."""
+        self.raw_data = self.read_raw(file_path, params)
+        return self.raw_data
+    
+    def read_raw(self, file_path: str, params: ISPParameters) -> np.ndarray:
+        """Read and interpret RAW file without touching processor state."""
         try:
-            with open(file_path, 'rb') as f:
-                data = f.read()
-            
-            # Calculate expected size
-            if params.packed:
-                # 10-bit packed: 4 pixels in 5 bytes
-                expected_bytes = (params.width * params.height * params.bpp) // 8
-            else:
-                # Unpacked: 16-bit per pixel
-                expected_bytes = params.width * params.height * 2
+            # Map the file instead of reading it into an intermediate bytes object;
+            # the OS pages in only what is touched
+            file_size = Path(file_path).stat().st_size
             
             # Try to interpret the data
             if params.packed and params.bpp == 10:
-                self.raw_data = self._unpack_10bit(data, params.width, params.height)
-            else:
-                # Assume 16-bit unpacked
-                self.raw_data = np.frombuffer(data[:expected_bytes], dtype=np.uint16)
-                if len(self.raw_data) >= params.width * params.height:
-                    self.raw_data = self.raw_data[:params.width * params.height]
-                    self.raw_data = self.raw_data.reshape((params.height, params.width))
+                # 10-bit packed: 4 pixels in 5 bytes
+                if file_size:
+                    data = np.memmap(file_path, dtype=np.uint8, mode='r')
                 else:
-                    # Fallback: create placeholder
-                    self.raw_data = self._create_placeholder(params.width, params.height)
+                    data = np.empty(0, dtype=np.uint8)
+                raw = self._unpack_10bit(data, params.width, params.height)
+            elif file_size >= params.width * params.height * 2:
+                # Assume 16-bit unpacked; copy out so the mapping is released
+                raw = np.array(np.memmap(file_path, dtype='<u2', mode='r',
+                                         shape=(params.height, params.width)))
+            else:
+                # Fallback: create placeholder
+                raw = self._create_placeholder(params.width, params.height)
             
-            return self.raw_data
+            return raw
             
         except Exception as e:
             print(f"Error loading RAW: {e}")
-            self.raw_data = self._create_placeholder(params.width, params.height)
-            return self.raw_data
+            return self._create_placeholder(params.width, params.height)
+    
+    def load_file(self, file_path: str,
+                  params: ISPParameters) -> Tuple[np.ndarray, Optional[int]]:
+        """Read a photo's mosaic and embedded Bayer pattern index (None if unknown).
+        
+        Re-opening a file that has not changed on disk, with the same raw format
+        parameters, returns the earlier read-only mosaic.
+        """
+        container = (rawpy is not None
+                     and Path(file_path).suffix.lower() in RAW_CONTAINER_SUFFIXES)
+        try:
+            stat = Path(file_path).stat()
+        except OSError:
+            stat = None
+        key = None
+        if stat is not None:
+            key = (file_path, stat.st_mtime_ns, stat.st_size, container) + tuple(
+                getattr(params, name) for name in RAW_FORMAT_FIELDS)
+            cached = self._load_cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if container:
+            raw, pattern = self.read_raw_container(file_path, params)
+        else:
+            raw, pattern = self.read_raw(file_path, params), None
+        
+        if key is not None:
+            raw.flags.writeable = False
+            # Copy-on-write so concurrent loads never see the dict mid-update
+            entries = dict(list(self._load_cache.items())[-(RAW_LOAD_CACHE_ENTRIES - 1):])
+            entries[key] = (raw, pattern)
+            self._load_cache = entries
+        return raw, pattern
+    
+    def read_raw_container(self, file_path: str,
+                           params: ISPParameters) -> Tuple[np.ndarray, Optional[int]]:
+        """Read the Bayer mosaic and its BAYER_PATTERNS index from a camera RAW file.
+        
+        Needs rawpy. The pattern is None when the sensor is not a 2x2 Bayer layout.
+        """
+        try:
+            with rawpy.imread(file_path) as container:
+                # Copy out; the visible-area view dies with the container
+                raw = np.array(container.raw_image_visible, dtype=np.uint16)
+                pattern = None
+                if container.raw_pattern is not None and container.raw_pattern.shape == (2, 2):
+                    # color_desc is e.g. b"RGBG"; index 3 is the second green
+                    desc = container.color_desc.decode()
+                    name = ''.join(desc[c] for c in container.raw_pattern.ravel())
+                    pattern = PATTERN_TO_INDEX.get(name)
+            return raw, pattern
+        
+        except Exception as e:
+            print(f"Error loading RAW: {e}")
+            return self._create_placeholder(params.width, params.height), None
     
     def _create_placeholder(self, width: int, height: int) -> np.ndarray:
         """Create a test pattern for visualization."""
@@ -437,92 +879,181 @@ class ISPProcessor:
         pattern = ((x // 100 + y // 100) % 2) * 512 + 256
         return pattern.astype(np.uint16)
     
-    def _unpack_10bit(self, data: bytes, width: int, height: int) -> np.ndarray:
+    def _unpack_10bit(self, data, width: int, height: int) -> np.ndarray:
         """Unpack 10-bit packed data."""
-        # Simplified unpacking - 4 pixels in 5 bytes
+        # 4 pixels in 5 bytes: bytes 0-3 hold the high 8 bits of each pixel,
+        # byte 4 holds their low 2 bits
         total_pixels = width * height
-        output = np.zeros(total_pixels, dtype=np.uint16)
-        
-        idx = 0
-        for i in range(0, min(len(data) - 4, (total_pixels * 5) // 4), 5):
-            if idx + 4 > total_pixels:
-                break
-            b0, b1, b2, b3, b4 = data[i:i+5]
-            output[idx] = ((b0 << 2) | (b4 & 0x03)) & 0x3FF
-            output[idx+1] = ((b1 << 2) | ((b4 >> 2) & 0x03)) & 0x3FF
-            output[idx+2] = ((b2 << 2) | ((b4 >> 4) & 0x03)) & 0x3FF
-            output[idx+3] = ((b3 << 2) | ((b4 >> 6) & 0x03)) & 0x3FF
-            idx += 4
-            
+        n_groups = min(len(data) // 5, total_pixels // 4)
+        output = np.empty(total_pixels, dtype=np.uint16)
+        output[n_groups * 4:] = 0
+        
+        packed = np.frombuffer(data, dtype=np.uint8, count=n_groups * 5)
+        if _unpack_10bit_nb is not None:
+            with NUMBA_LOCK:
+                _unpack_10bit_nb(packed, output, n_groups)
+            return output.reshape((height, width))
+        
+        packed = packed.reshape(-1, 5).astype(np.uint16)
+        low_bits = packed[:, 4]
+        lanes = output[:n_groups * 4].reshape(-1, 4)
+        for lane in range(4):
+            lanes[:, lane] = (packed[:, lane] << 2) | ((low_bits >> (2 * lane)) & 0x03)
+        
         return output.reshape((height, width))
     
     def apply_black_level(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
-        """Apply black level correction."""
-        result = image.astype(np.float32)
-        h, w = result.shape[:2]
+        """Apply black level correction, keeping integer sensor data as uint16."""
+        result = np.empty(image.shape, dtype=np.uint16)
         
         # Apply per-channel black level based on Bayer pattern
         pattern = BAYER_PATTERNS.get(params.bayer_pattern, "RGGB")
         
-        for y in range(2):
-            for x in range(2):
-                channel = pattern[y * 2 + x]
-                if channel == 'R':
-                    bl = params.black_level_r
-                elif channel == 'B':
-                    bl = params.black_level_b
-                else:  # G
-                    bl = params.black_level_gr if x == 1 else params.black_level_gb
-                
-                result[y::2, x::2] = np.maximum(0, result[y::2, x::2] - bl)
+        for (y, x), plane in self._phase_planes(image):
+            channel = pattern[y * 2 + x]
+            bl = self._phase_black_level(channel, x, params)
+            # Clamp up to the black level first so the unsigned subtract cannot wrap
+            out = result[y::2, x::2]
+            np.maximum(plane, bl, out=out)
+            out -= bl
         
         return result
     
+    @staticmethod
+    def _phase_black_level(channel: str, x: int, params: ISPParameters) -> int:
+        """Black level for one Bayer phase."""
+        if channel == 'R':
+            return params.black_level_r
+        if channel == 'B':
+            return params.black_level_b
+        return params.black_level_gr if x == 1 else params.black_level_gb
+    
+    @staticmethod
+    def _extract_phases(raw: np.ndarray):
+        """Return ((y, x), plane) for the four Bayer phase planes of a mosaic."""
+        return [((y, x), raw[y::2, x::2]) for y in range(2) for x in range(2)]
+    
+    def _phase_planes(self, raw: np.ndarray):
+        """Like _extract_phases, but with contiguous copies cached per mosaic.
+        
+        The stages re-read the same mosaic on every render; dense planes let the
+        per-phase arithmetic run on unit-stride data instead of stride-2 views.
+        """
+        cached = self._phases
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        planes = [(pos, np.ascontiguousarray(plane)) for pos, plane in self._extract_phases(raw)]
+        self._phases = (raw, planes)
+        return planes
+    
+    def _process_bayer_fused(self, raw: np.ndarray, params: ISPParameters) -> np.ndarray:
+        """Black level, manual white balance and demosaic in one pass over the phases.
+        
+        Black level and WB gain are applied to each quarter-size phase plane
+        while the mosaic is still single-channel; the bilinear demosaic only
+        mixes samples of the same colour, so gains commute with it exactly.
+        The mosaic stays uint16, with gains applied in Q8.8 fixed point.
+        """
+        pattern = BAYER_PATTERNS.get(params.bayer_pattern, "RGGB")
+        gains = {'R': params.wb_r_gain, 'G': params.wb_g_gain, 'B': params.wb_b_gain}
+        
+        mosaic = np.empty(raw.shape, dtype=np.uint16)
+        for (y, x), plane in self._phase_planes(raw):
+            channel = pattern[y * 2 + x]
+            bl = self._phase_black_level(channel, x, params)
+            acc = np.maximum(plane, bl).astype(np.uint32)
+            acc -= bl
+            acc *= int(round(gains[channel] * 256))
+            acc += 128  # round to nearest on the shift back
+            acc >>= 8
+            np.minimum(acc, 0xFFFF, out=acc)
+            mosaic[y::2, x::2] = acc
+        
+        return self.demosaic(mosaic, params)
+    
     def demosaic(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
         """Demosaic Bayer pattern to RGB."""
         h, w = image.shape
-        rgb = np.zeros((h, w, 3), dtype=np.float32)
-        
         pattern = BAYER_PATTERNS.get(params.bayer_pattern, "RGGB")
         
-        # Simple bilinear demosaic
+        if pattern in CV2_BAYER_CODES:
+            # OpenCV's native bilinear demosaic
+            if image.dtype != np.uint16:
+                image = np.clip(image, 0, 0xFFFF).astype(np.uint16)
+            return cv2.cvtColor(image, CV2_BAYER_CODES[pattern]).astype(np.float32)
+        
+        rgb = np.zeros((h, w, 3), dtype=np.float32)
+        
+        # Scatter samples into sparse per-channel planes
         for y in range(2):
             for x in range(2):
-                channel = pattern[y * 2 + x]
-                if channel == 'R':
-                    rgb[y::2, x::2, 0] = image[y::2, x::2]
-                elif channel == 'B':
-                    rgb[y::2, x::2, 2] = image[y::2, x::2]
-                else:
-                    rgb[y::2, x::2, 1] = image[y::2, x::2]
-        
-        # Interpolate missing values (simplified)
-        from scipy import ndimage
-        for c in range(3):
-            mask = rgb[:, :, c] == 0
-            if np.any(mask):
-                rgb[:, :, c] = ndimage.generic_filter(
-                    rgb[:, :, c], 
-                    lambda x: np.mean(x[x > 0]) if np.any(x > 0) else 0,
-                    size=3
-                )
+                rgb[y::2, x::2, self._channel_index(pattern[y * 2 + x])] = image[y::2, x::2]
+        
+        # Bilinear interpolation as a normalized convolution: weighted sum of
+        # neighbouring samples divided by the weight of samples present, which
+        # keeps known pixels exact and handles borders without padding tricks
+        inv_weights = self._demosaic_inv_weights(h, w, pattern)
+        for c, kernel in ((0, DEMOSAIC_RB_KERNEL), (1, DEMOSAIC_G_KERNEL), (2, DEMOSAIC_RB_KERNEL)):
+            total = self._convolve3x3(rgb[:, :, c], kernel)
+            np.multiply(total, inv_weights[c], out=rgb[:, :, c])
         
         return rgb
     
+    @staticmethod
+    def _channel_index(channel: str) -> int:
+        """Map a Bayer channel letter to its RGB plane index."""
+        if channel == 'R':
+            return 0
+        if channel == 'B':
+            return 2
+        return 1
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=2)
+    def _demosaic_inv_weights(h: int, w: int, pattern: str) -> np.ndarray:
+        """Reciprocal per-channel sample weights for the normalized-convolution demosaic.
+        
+        The weights depend only on the frame shape and pattern, so the sampling
+        masks and their convolutions are built once rather than per frame.
+        Positions with no samples in reach get 0, leaving the output at 0.
+        """
+        inv = np.zeros((3, h, w), dtype=np.float32)
+        for c, kernel in ((0, DEMOSAIC_RB_KERNEL), (1, DEMOSAIC_G_KERNEL), (2, DEMOSAIC_RB_KERNEL)):
+            sampled = np.zeros((h, w), dtype=np.float32)
+            for y in range(2):
+                for x in range(2):
+                    if ISPProcessor._channel_index(pattern[y * 2 + x]) == c:
+                        sampled[y::2, x::2] = 1.0
+            weight = ISPProcessor._convolve3x3(sampled, kernel)
+            np.divide(1.0, weight, out=inv[c], where=weight > 0)
+        inv.flags.writeable = False
+        return inv
+    
+    @staticmethod
+    def _convolve3x3(plane: np.ndarray, kernel) -> np.ndarray:
+        """Correlate a 2-D array with a 3x3 kernel, zero-padded at the borders."""
+        h, w = plane.shape
+        padded = np.pad(plane, 1)
+        out = np.zeros_like(plane)
+        for dy in range(3):
+            for dx in range(3):
+                k = kernel[dy][dx]
+                if k:
+                    out += k * padded[dy:dy + h, dx:dx + w]
+        return out
+    
     def apply_white_balance(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
         """Apply white balance gains."""
-        result = image.copy()
-        
         if params.auto_wb:
             # Simple gray world assumption
-            means = np.mean(result, axis=(0, 1))
+            means = np.mean(image, axis=(0, 1))
             gray = np.mean(means)
             gains = gray / (means + 1e-6)
         else:
             gains = np.array([params.wb_r_gain, params.wb_g_gain, params.wb_b_gain])
         
-        result *= gains
-        return result
+        # Multiply straight into the output instead of copying first
+        return np.multiply(image, gains.astype(np.float32))
     
     def apply_lens_shading(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
         """Apply lens shading correction."""
@@ -530,159 +1061,609 @@ class ISPProcessor:
             return image
             
         h, w = image.shape[:2]
-        y, x = np.ogrid[:h, :w]
-        
-        # Calculate distance from center
-        cx = w * params.lsc_center_x
-        cy = h * params.lsc_center_y
-        
-        dist = np.sqrt((x - cx)**2 + (y - cy)**2)
-        max_dist = np.sqrt(cx**2 + cy**2)
-        
-        # Vignette correction (inverse of typical vignette)
-        correction = 1.0 + params.lsc_strength * (dist / max_dist) ** 2
+        correction = self._lsc_map(h, w, params.lsc_center_x, params.lsc_center_y,
+                                   params.lsc_strength)
         
         if len(image.shape) == 3:
             correction = correction[:, :, np.newaxis]
         
         return image * correction
     
-    def apply_gtm(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _lsc_map(h: int, w: int, cx_frac: float, cy_frac: float,
+                 strength: float) -> np.ndarray:
+        """Build the (read-only) radial gain map for lens shading correction."""
+        y, x = ISPProcessor._lsc_terms(h, w, cx_frac, cy_frac, strength)
+        
+        # Vignette correction (inverse of typical vignette)
+        correction = np.add(y[:, np.newaxis], x[np.newaxis, :])
+        correction.flags.writeable = False
+        return correction
+    
+    @staticmethod
+    def _lsc_terms(h: int, w: int, cx_frac: float, cy_frac: float,
+                   strength: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and column terms whose broadcast sum is the LSC gain map."""
+        # Calculate distance from center
+        cx = np.float32(w * cx_frac)
+        cy = np.float32(h * cy_frac)
+        x = np.arange(w, dtype=np.float32) - cx
+        y = np.arange(h, dtype=np.float32) - cy
+        
+        # Only the squared distance is needed: (dist / max_dist) ** 2 == dist2 / max_dist2.
+        # It is separable, so the scale and the +1 are applied to the 1-D terms
+        # and the full-size map is produced by a single broadcast add
+        k = np.float32(strength / (cx * cx + cy * cy))
+        x *= x
+        x *= k
+        y *= y
+        y *= k
+        y += np.float32(1.0)
+        return y, x
+    
+    # The tonal stages below take the input maximum when the caller already knows it
+    # and return (image, new_max), deriving new_max analytically instead of reducing
+    # the whole image again. A None maximum means "unknown" and is computed on demand.
+    
+    def apply_gtm(self, image: np.ndarray, params: ISPParameters,
+                  max_val: Optional[float] = None) -> Tuple[np.ndarray, Optional[float]]:
         """Apply global tone mapping."""
         if not params.gtm_enabled:
-            return image
-            
-        # Normalize
-        max_val = image.max() if image.max() > 0 else 1
-        result = image / max_val
+            return image, max_val
+        
+        if max_val is None:
+            max_val = float(image.max())
         
-        # Apply contrast
-        result = ((result - 0.5) * params.gtm_contrast + 0.5)
+        # Normalize and apply contrast: (x / norm - 0.5) * contrast + 0.5,
+        # folded into one scale and one offset on a single buffer
+        norm = max_val if max_val > 0 else 1
+        result = np.multiply(image, params.gtm_contrast / norm)
+        result += 0.5 - 0.5 * params.gtm_contrast
         
         # Apply strength (simple S-curve)
         if params.gtm_strength != 1.0:
-            result = result ** (1.0 / params.gtm_strength)
+            # Negative values end up clipped to 0 below; clamp them first so the
+            # fractional power does not turn them into NaN
+            np.maximum(result, 0, out=result)
+            np.power(result, 1.0 / params.gtm_strength, out=result)
         
-        return np.clip(result * max_val, 0, max_val)
+        result *= norm
+        return np.clip(result, 0, norm, out=result), self._gtm_output_max(max_val, params)
     
-    def apply_exposure(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
+    @staticmethod
+    def _gtm_output_max(max_val: float, params: ISPParameters) -> float:
+        """Maximum after GTM for an input maximum of max_val."""
+        norm = max_val if max_val > 0 else 1
+        # The curve is increasing for positive contrast, so it maps max to max
+        top = (max_val / norm - 0.5) * params.gtm_contrast + 0.5
+        if params.gtm_strength != 1.0:
+            top = max(top, 0.0) ** (1.0 / params.gtm_strength)
+        return min(max(top * norm, 0.0), norm)
+    
+    def apply_exposure(self, image: np.ndarray, params: ISPParameters,
+                       max_val: Optional[float] = None) -> Tuple[np.ndarray, Optional[float]]:
         """Apply exposure compensation."""
         # EV adjustment
         ev_multiplier = 2 ** params.exposure_ev
         result = image * ev_multiplier
         
+        if max_val is None and (params.highlight_recovery > 0 or params.shadow_recovery > 0):
+            max_val = float(image.max())
+        if max_val is not None:
+            max_val *= ev_multiplier
+        
+        hl_threshold, sh_threshold, max_val = self._recovery_thresholds(max_val, params)
+        
         # Highlight recovery (compress highlights)
-        if params.highlight_recovery > 0:
-            max_val = result.max() if result.max() > 0 else 1
-            threshold = max_val * 0.8
-            mask = result > threshold
-            result[mask] = threshold + (result[mask] - threshold) * (1 - params.highlight_recovery * 0.5)
+        if hl_threshold is not None:
+            compress = 1 - params.highlight_recovery * 0.5
+            # threshold + (x - threshold) * compress, in place on the masked pixels
+            mask = result > hl_threshold
+            np.multiply(result, compress, out=result, where=mask)
+            np.add(result, hl_threshold * (1 - compress), out=result, where=mask)
         
         # Shadow recovery (lift shadows)
-        if params.shadow_recovery > 0:
-            max_val = result.max() if result.max() > 0 else 1
-            threshold = max_val * 0.2
-            mask = result < threshold
-            result[mask] = result[mask] * (1 + params.shadow_recovery)
+        if sh_threshold is not None:
+            np.multiply(result, 1 + params.shadow_recovery, out=result,
+                        where=result < sh_threshold)
         
-        return result
+        return result, max_val
+    
+    @staticmethod
+    def _recovery_thresholds(max_val: Optional[float], params: ISPParameters) -> tuple:
+        """Highlight and shadow thresholds for a post-EV maximum, and the maximum after both.
+        
+        A threshold is None when that recovery is off.
+        """
+        hl_threshold = sh_threshold = None
+        if params.highlight_recovery > 0:
+            hl_threshold = (max_val if max_val > 0 else 1) * 0.8
+            if max_val > hl_threshold:
+                max_val = hl_threshold + (max_val - hl_threshold) * (1 - params.highlight_recovery * 0.5)
+        if params.shadow_recovery > 0:
+            sh_threshold = (max_val if max_val > 0 else 1) * 0.2
+            if max_val < sh_threshold:
+                max_val *= 1 + params.shadow_recovery
+        return hl_threshold, sh_threshold, max_val
     
-    def apply_gamma(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
+    def apply_gamma(self, image: np.ndarray, params: ISPParameters,
+                    max_val: Optional[float] = None) -> Tuple[np.ndarray, Optional[float]]:
         """Apply gamma correction."""
         if not params.gamma_enabled:
-            return image
-            
-        max_val = image.max() if image.max() > 0 else 1
-        normalized = image / max_val
-        corrected = np.power(normalized, 1.0 / params.gamma_value)
-        return corrected * max_val
+            return image, max_val
+        
+        if max_val is None:
+            max_val = float(image.max())
+        if max_val <= 0:
+            return self._gamma_from_lut(image, 1, params.gamma_value, 1), None
+        return self._gamma_from_lut(image, max_val, params.gamma_value, max_val), max_val
+    
+    def _fuse_tonal(self, image: np.ndarray, ev_multiplier: float, gamma: float,
+                    max_val: Optional[float] = None) -> Tuple[np.ndarray, Optional[float]]:
+        """Apply exposure gain and gamma correction in a single pass.
+        
+        Gamma normalizes by the post-exposure maximum, so the EV gain cancels
+        inside the power and survives only as an output scale.
+        """
+        if max_val is None:
+            max_val = float(image.max())
+        if max_val <= 0:
+            return self._gamma_from_lut(image, 1, gamma, ev_multiplier), None
+        return (self._gamma_from_lut(image, max_val, gamma, max_val * ev_multiplier),
+                max_val * ev_multiplier)
+    
+    def _gamma_from_lut(self, image: np.ndarray, max_val: float, gamma: float,
+                        scale: float) -> np.ndarray:
+        """Return (image / max_val) ** (1 / gamma) * scale."""
+        if _apply_lut_nb is None:
+            # NumPy's vectorized power beats a NumPy-side table gather
+            result = np.divide(image, max_val)
+            np.power(result, 1.0 / gamma, out=result)
+            result *= scale
+            return result
+        
+        lut = (self._gamma_curve(gamma) * scale).astype(image.dtype)
+        
+        flat = np.ascontiguousarray(image).reshape(-1)
+        result = np.empty_like(flat)
+        with NUMBA_LOCK:
+            _apply_lut_nb(flat, lut, (GAMMA_LUT_SIZE - 1) / max_val, result)
+        return result.reshape(image.shape)
+    
+    def _gamma_curve(self, gamma: float) -> np.ndarray:
+        """Unit gamma curve at GAMMA_LUT_SIZE square-root spaced points, cached per gamma.
+        
+        Entry i holds ((i / top) ** 2) ** (1 / gamma), so the points crowd
+        towards 0 where the curve is steepest.
+        """
+        cached = self._gamma_lut
+        if cached is None or cached[0] != gamma:
+            curve = np.power(np.linspace(0.0, 1.0, GAMMA_LUT_SIZE), 2.0 / gamma)
+            cached = (gamma, curve)
+            self._gamma_lut = cached
+        return cached[1]
+    
+    def _scratch(self, name: str, shape: tuple, dtype=np.float32) -> np.ndarray:
+        """Return this thread's reusable buffer for name, reallocated on shape changes.
+        
+        The contents are only valid until the same thread asks for name again, so
+        results that outlive the call (caches, processed_stages) never use it.
+        """
+        buffers = getattr(self._scratch_local, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch_local.buffers = {}
+        buf = buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = buffers[name] = np.empty(shape, dtype=dtype)
+        return buf
+    
+    def _run_tonal_fused(self, image: np.ndarray, stage: int, params: ISPParameters,
+                         out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[float]]:
+        """Run LSC through colour correction (up to stage) as one Numba pass.
+        
+        Mirrors the stage methods: the image is reduced once, after LSC, when a
+        stage needs its maximum; every later maximum is derived as they do.
+        out, if given, is a float32 array of the image's shape to write into.
+        """
+        h, w, _ = image.shape
+        image = np.ascontiguousarray(image, dtype=np.float32)
+        if params.lsc_enabled:
+            lsc_y, lsc_x = self._lsc_terms(h, w, params.lsc_center_x, params.lsc_center_y,
+                                           params.lsc_strength)
+        else:
+            lsc_y, lsc_x = np.ones(h, dtype=np.float32), np.zeros(w, dtype=np.float32)
+        
+        do_gtm = stage >= 5 and params.gtm_enabled
+        do_exposure = stage >= 6
+        do_gamma = stage >= 7 and params.gamma_enabled
+        do_cc = stage >= 8
+        
+        cur_max = None
+        if do_gtm or do_gamma or (do_exposure and (params.highlight_recovery > 0
+                                                   or params.shadow_recovery > 0)):
+            row_max = np.empty(h, dtype=np.float32)
+            with NUMBA_LOCK:
+                _lsc_row_max_nb(image, lsc_y, lsc_x, row_max)
+            cur_max = float(row_max.max())
+        
+        gtm_scale, gtm_offset, gtm_power, gtm_norm = 1.0, 0.0, 1.0, 1.0
+        if do_gtm:
+            gtm_norm = cur_max if cur_max > 0 else 1
+            gtm_scale = params.gtm_contrast / gtm_norm
+            gtm_offset = 0.5 - 0.5 * params.gtm_contrast
+            gtm_power = 1.0 / params.gtm_strength
+            cur_max = self._gtm_output_max(cur_max, params)
+        
+        ev, hl_threshold, sh_threshold = 1.0, np.inf, -np.inf
+        if do_exposure:
+            ev = 2 ** params.exposure_ev
+            if cur_max is not None:
+                cur_max *= ev
+            hl, sh, cur_max = self._recovery_thresholds(cur_max, params)
+            if hl is not None:
+                hl_threshold = hl
+            if sh is not None:
+                sh_threshold = sh
+        
+        lut, lut_k = np.zeros(1, dtype=np.float32), 0.0
+        if do_gamma:
+            gamma_norm = cur_max if cur_max > 0 else 1
+            lut = (self._gamma_curve(params.gamma_value) * gamma_norm).astype(np.float32)
+            lut_k = (GAMMA_LUT_SIZE - 1) / gamma_norm
+            if cur_max <= 0:
+                cur_max = None
+        
+        matrix = self._color_matrix(params.saturation)
+        if do_cc:
+            cur_max = None
+        
+        # float32 scalars keep the per-pixel arithmetic in single precision
+        f32 = np.float32
+        if out is None:
+            out = np.empty_like(image)
+        with NUMBA_LOCK:
+            _tonal_chain_nb(image.reshape(h, w * 3), out.reshape(h, w * 3),
+                            lsc_y, np.repeat(lsc_x, 3),
+                            do_gtm, f32(gtm_scale), f32(gtm_offset), f32(gtm_power), f32(gtm_norm),
+                            f32(ev), f32(hl_threshold), f32(1 - params.highlight_recovery * 0.5),
+                            f32(sh_threshold), f32(1 + params.shadow_recovery),
+                            do_gamma, lut, f32(lut_k), do_cc, matrix)
+        return out, cur_max
     
     def apply_color_correction(self, image: np.ndarray, params: ISPParameters) -> np.ndarray:
         """Apply color correction (saturation, hue)."""
         if len(image.shape) != 3:
             return image
-            
-        # Convert to HSV-like for saturation adjustment
-        result = image.copy()
         
-        # Simple saturation adjustment
-        gray = np.mean(result, axis=2, keepdims=True)
-        result = gray + (result - gray) * params.saturation
+        # The saturation blend is linear, so one matrix product applies it
+        matrix = self._color_matrix(params.saturation)
+        result = image @ matrix.astype(image.dtype)
         
-        return np.clip(result, 0, result.max())
+        return np.maximum(result, 0, out=result)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _color_matrix(saturation: float) -> np.ndarray:
+        """(Transposed) matrix for the saturation blend.
+        
+        Saturation is gray + (rgb - gray) * s with gray the channel average, i.e.
+        s * I + (1 - s) * [1/3 ...] applied to each pixel.
+        """
+        sat = saturation * np.eye(3) + (1.0 - saturation) * np.outer(np.ones(3), GRAY_WEIGHTS)
+        matrix = np.ascontiguousarray(sat.T, dtype=np.float32)
+        matrix.flags.writeable = False
+        return matrix
     
     def process_stage(self, stage: int, params: ISPParameters) -> np.ndarray:
         """Process a specific ISP stage."""
-        if self.raw_data is None:
-            return self._create_placeholder(params.width, params.height)
+        return self._run_stages(stage, params)[0]
+    
+    def preview_raw(self, raw: np.ndarray, width: int, height: int) -> np.ndarray:
+        """Return raw binned towards width x height, keeping the Bayer layout.
+        
+        Each phase plane is box-averaged by the same integer factor, so the result
+        is again a valid mosaic of the same pattern. The binned mosaic is cached
+        until a different mosaic is binned.
+        """
+        if width <= 0 or height <= 0:
+            return raw
+        
+        h, w = raw.shape
+        step = min(w // width, h // height)
+        if step < 2:
+            return raw
+        
+        cached = self._preview
+        if cached is not None and cached[0] is raw and cached[1] == step:
+            return cached[2]
+        
+        # Phase-plane extent that divides evenly by the bin factor
+        ph = (h // 2) // step * step
+        pw = (w // 2) // step * step
+        binned = np.empty((ph // step * 2, pw // step * 2), dtype=raw.dtype)
+        area = step * step
+        for (y, x), plane in self._extract_phases(raw):
+            sums = plane[:ph, :pw].reshape(ph // step, step, pw // step, step).sum(
+                axis=(1, 3), dtype=np.uint32)
+            binned[y::2, x::2] = (sums + area // 2) // area
+        
+        self._preview = (raw, step, binned)
+        return binned
+    
+    def _run_stages(self, stage: int, params: ISPParameters,
+                    raw: Optional[np.ndarray] = None) -> Tuple[np.ndarray, Optional[float]]:
+        """Process up to a stage, returning the image and its maximum (None if unknown).
+        
+        raw overrides the loaded mosaic (e.g. with a preview); only full-resolution
+        results are kept in processed_stages.
+        """
+        full_res = raw is None
+        if full_res:
+            raw = self.raw_data
+        if raw is None:
+            return self._create_placeholder(params.width, params.height), None
         
         # Process sequentially up to the requested stage
-        image = self.raw_data.astype(np.float32)
-        
-        if stage >= 1:  # Black Level
-            image = self.apply_black_level(self.raw_data, params)
-        
-        if stage >= 2:  # Demosaic
-            try:
-                image = self.demosaic(image if stage > 1 else self.apply_black_level(self.raw_data, params), params)
-            except ImportError:
-                # Fallback without scipy
-                h, w = image.shape if len(image.shape) == 2 else image.shape[:2]
-                if len(image.shape) == 2:
-                    image = np.stack([image, image, image], axis=-1)
+        image = self._run_front_stages(raw, stage, params)
         
-        if stage >= 3:  # White Balance
-            image = self.apply_white_balance(image, params)
-        
-        if stage >= 4:  # Lens Shading
-            image = self.apply_lens_shading(image, params)
-        
-        if stage >= 5:  # GTM
-            image = self.apply_gtm(image, params)
-        
-        if stage >= 6:  # Exposure
-            image = self.apply_exposure(image, params)
-        
-        if stage >= 7:  # Gamma
-            image = self.apply_gamma(image, params)
+        if stage >= 5 and _tonal_chain_nb is not None:
+            # Lens Shading through Color Correction in one fused pass; previews
+            # are converted and dropped right away, so they reuse a scratch buffer
+            out = None if full_res else self._scratch('tonal', image.shape)
+            image, cur_max = self._run_tonal_fused(image, stage, params, out)
+        else:
+            if stage >= 4:  # Lens Shading
+                image = self.apply_lens_shading(image, params)
+            
+            # Maximum of the current image; the tonal stages keep it up to date
+            cur_max = None
+            
+            if stage >= 5:  # GTM
+                image, cur_max = self.apply_gtm(image, params, cur_max)
+            
+            if (stage >= 7 and params.gamma_enabled
+                    and params.highlight_recovery <= 0 and params.shadow_recovery <= 0):
+                # Plain EV gain followed by gamma folds into one pass
+                image, cur_max = self._fuse_tonal(image, 2 ** params.exposure_ev,
+                                                  params.gamma_value, cur_max)
+            else:
+                if stage >= 6:  # Exposure
+                    image, cur_max = self.apply_exposure(image, params, cur_max)
+            
+                if stage >= 7:  # Gamma
+                    image, cur_max = self.apply_gamma(image, params, cur_max)
+            
+            if stage >= 8:  # Color Correction
+                image = self.apply_color_correction(image, params)
+                cur_max = None
         
-        if stage >= 8:  # Color Correction
-            image = self.apply_color_correction(image, params)
+        if full_res:
+            self.processed_stages[stage] = image
+        return image, cur_max
+    
+    def _run_front_stages(self, raw: np.ndarray, stage: int,
+                          params: ISPParameters) -> np.ndarray:
+        """Run stages 0 to min(stage, FRONT_LAST_STAGE), memoized per mosaic.
+        
+        Tuning a later stage leaves these inputs untouched, so only the stages
+        from LSC on are recomputed. Cached images are read-only.
+        """
+        front = min(stage, FRONT_LAST_STAGE)
+        signature = (front,) + tuple(getattr(params, name) for name in STAGE_DEPS[front])
+        
+        cached = self._front_cache
+        entries = cached[1] if cached is not None and cached[0] is raw else {}
+        image = entries.get(signature)
+        if image is not None:
+            return image
         
-        self.processed_stages[stage] = image
+        if front == 0:  # Raw Interpretation
+            image = raw.astype(np.float32)
+        elif front == 3 and not params.auto_wb:
+            # Black Level + White Balance + Demosaic on the Bayer phases
+            image = self._process_bayer_fused(raw, params)
+        else:
+            image = self.apply_black_level(raw, params)
+            
+            if front >= 2:  # Demosaic
+                image = self.demosaic(image, params)
+            
+            if front >= 3:  # White Balance (gray world needs the demosaiced means)
+                image = self.apply_white_balance(image, params)
+        
+        image.flags.writeable = False
+        # Copy-on-write so render workers never see the dict mid-update
+        entries = dict(list(entries.items())[-(FRONT_CACHE_ENTRIES - 1):])
+        entries[signature] = image
+        self._front_cache = (raw, entries)
         return image
     
-    def to_qimage(self, image: np.ndarray) -> QImage:
-        """Convert numpy array to QImage."""
+    def to_qimage(self, image: np.ndarray, max_width: int = 0, max_height: int = 0,
+                  max_val: Optional[float] = None) -> QImage:
+        """Convert numpy array to QImage, decimated towards max_width x max_height.
+        
+        max_val, if known, is the full image's maximum and is used for normalization.
+        """
         if image is None:
             return QImage()
         
+        # Drop pixels the display would scale away before converting to 8-bit
+        if max_width > 0 and max_height > 0:
+            h, w = image.shape[:2]
+            step = min(w // max_width, h // max_height)
+            if image.ndim == 2 and step % 2 == 0:
+                # Odd steps keep all Bayer phases visible in the mosaic
+                step -= 1
+            if step > 1:
+                image = image[::step, ::step]
+        
         # Normalize to 8-bit
-        if image.max() > 0:
-            normalized = (image / image.max() * 255).astype(np.uint8)
+        if max_val is None:
+            max_val = image.max()
+        if max_val > 0:
+            # One scaled temporary (reused per thread), then a single cast into
+            # the contiguous output
+            scaled = np.multiply(image, 255.0 / max_val,
+                                 out=self._scratch('to_qimage', image.shape))
+            normalized = scaled.astype(np.uint8)
         else:
-            normalized = np.zeros_like(image, dtype=np.uint8)
+            normalized = np.zeros(image.shape, dtype=np.uint8)
         
         if len(normalized.shape) == 2:
             # Grayscale
             h, w = normalized.shape
-            return QImage(normalized.data, w, h, w, QImage.Format.Format_Grayscale8)
+            qimage = QImage(normalized.data, w, h, w, QImage.Format.Format_Grayscale8)
+        elif normalized.shape[2] == 3:
+            # RGB, read straight from the packed array
+            h, w, _ = normalized.shape
+            qimage = QImage(normalized.data, w, h, w * 3, QImage.Format.Format_RGB888)
         else:
-            # RGB
-            h, w, c = normalized.shape
-            if c == 3:
-                # Convert RGB to RGBA
-                rgba = np.zeros((h, w, 4), dtype=np.uint8)
-                rgba[:, :, :3] = normalized
-                rgba[:, :, 3] = 255
-                return QImage(rgba.data, w, h, w * 4, QImage.Format.Format_RGBA8888)
+            return QImage()
         
-        return QImage()
+        # QImage does not own the buffer; keep the array alive as long as the wrapper
+        qimage._backing = normalized
+        return qimage
+    
+    def render_preview(self, stage: int, params: ISPParameters, raw: np.ndarray,
+                       width: int, height: int) -> QImage:
+        """Process raw up to a stage and scale the result to fit width x height.
+        
+        The pipeline runs on a mosaic binned towards the target size, so its
+        cost follows the display rather than the sensor resolution.
+        """
+        processed, max_val = self._run_stages(stage, params, self.preview_raw(raw, width, height))
+        qimage = self.to_qimage(processed, width, height, max_val)
+        if qimage.isNull():
+            return qimage
+        return qimage.scaled(
+            width,
+            height,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        )
+
+
+class LoadSignals(QObject):
+    """Signals emitted by background load tasks: (file path, result)."""
+    finished = pyqtSignal(str, object)
+
+
+class RawLoadSignals(QObject):
+    """Signals emitted by RawLoadTask: (load generation, file path, mosaic, Bayer pattern).
+    
+    The pattern is the one found in the file itself, or None.
+    """
+    finished = pyqtSignal(int, str, object, object)
+
+
+class RawLoadTask(QRunnable):
+    """Read and unpack a RAW file on a worker thread."""
+    
+    def __init__(self, processor: ISPProcessor, file_path: str, params: ISPParameters,
+                 generation: int):
+        super().__init__()
+        self.processor = processor
+        self.file_path = file_path
+        self.params = params
+        self.generation = generation
+        self.signals = RawLoadSignals()
+    
+    def run(self):
+        raw, pattern = self.processor.load_file(self.file_path, self.params)
+        self.signals.finished.emit(self.generation, self.file_path, raw, pattern)
+
+
+class MetadataLoadTask(QRunnable):
+    """Read and parse a metadata text file on a worker thread."""
+    
+    def __init__(self, file_path: str):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = LoadSignals()
+    
+    def run(self):
+        try:
+            with open(self.file_path, 'r', encoding='utf-8', errors='replace', buffering=65536) as f:
+                content = f.read(METADATA_MAX_CHARS)
+            metadata = MetadataParser.parse(content)
+        except Exception as e:
+            print(f"Error parsing metadata: {e}")
+            return
+        self.signals.finished.emit(self.file_path, metadata)
+
+
+class RenderSignals(QObject):
+    """Signals emitted by StageRenderTask: (stage, cache key, scaled image)."""
+    finished = pyqtSignal(int, str, QImage)
+
+
+class StageRenderTask(QRunnable):
+    """Render a scaled stage preview on a worker thread."""
+    
+    def __init__(self, processor: ISPProcessor, stage: int, params: ISPParameters,
+                 raw: np.ndarray, width: int, height: int, key: str):
+        super().__init__()
+        self.processor = processor
+        self.stage = stage
+        self.params = params
+        self.raw = raw
+        self.width = width
+        self.height = height
+        self.key = key
+        self.signals = RenderSignals()
+    
+    def run(self):
+        try:
+            image = self.processor.render_preview(self.stage, self.params, self.raw,
+                                                  self.width, self.height)
+        except Exception as e:
+            print(f"Error rendering stage {self.stage}: {e}")
+            image = QImage()
+        self.signals.finished.emit(self.stage, self.key, image)
+
+
+class ProgressDots(QWidget):
+    """Row of slide progress dots, painted by one widget instead of one per dot."""
+    
+    DOT_SIZE = 8
+    SPACING = 8
+    ACTIVE_COLOR = QColor("#228be6")
+    DONE_COLOR = QColor("#40c057")
+    PENDING_COLOR = QColor("#dee2e6")
+    
+    def __init__(self, count: int, parent=None):
+        super().__init__(parent)
+        self.count = count
+        self.current = 0
+        self.setFixedSize(count * self.DOT_SIZE + (count - 1) * self.SPACING, self.DOT_SIZE)
+    
+    def set_current(self, index: int):
+        """Mark a slide as current; earlier slides show as done."""
+        if index != self.current:
+            self.current = index
+            self.update()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        for i in range(self.count):
+            if i == self.current:
+                painter.setBrush(self.ACTIVE_COLOR)
+            elif i < self.current:
+                painter.setBrush(self.DONE_COLOR)
+            else:
+                painter.setBrush(self.PENDING_COLOR)
+            painter.drawEllipse(i * (self.DOT_SIZE + self.SPACING), 0, self.DOT_SIZE, self.DOT_SIZE)
 
 
 class ParameterPanel(QScrollArea):
     """Scrollable panel for ISP parameters."""
     
+    # A slider was released on a new value
+    edited = pyqtSignal()
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWidgetResizable(True)
@@ -690,23 +1671,70 @@ class ParameterPanel(QScrollArea):
         self.setObjectName("paramPanel")
         
         self.container = QWidget()
-        self.layout = QVBoxLayout(self.container)
-        self.layout.setSpacing(12)
-        self.layout.setContentsMargins(16, 16, 16, 16)
+        self.outer_layout = QVBoxLayout(self.container)
+        self.outer_layout.setSpacing(12)
+        self.outer_layout.setContentsMargins(16, 16, 16, 16)
+        
+        # One page per stage, built on first visit; switching slides flips the page
+        self.metadata_group: Optional[QGroupBox] = None
+        self.stack = QStackedWidget()
+        self.outer_layout.addWidget(self.stack)
         
         self.setWidget(self.container)
-        self.widgets: Dict[str, QWidget] = {}
-        
-    def clear(self):
-        """Clear all parameter widgets."""
-        while self.layout.count():
-            item = self.layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        self.widgets.clear()
-    
-    def add_metadata_display(self, metadata: RawMetadata):
-        """Add metadata display section."""
+        self.stages: Tuple[StageSpec, ...] = ()
+        # Per stage: widget map and page, None until first shown
+        self.pages: List[Optional[Dict[str, Any]]] = []
+        self.page_widgets: List[Optional[QWidget]] = []
+        # Layout and widget map of the page being built or shown
+        self.layout: Optional[QVBoxLayout] = None
+        self.widgets: Dict[str, Any] = {}
+    
+    def set_stages(self, stages: Tuple[StageSpec, ...]):
+        """Register the StageSpecs; each page is built the first time it is shown."""
+        self.stages = stages
+        self.pages = [None] * len(stages)
+        self.page_widgets = [None] * len(stages)
+    
+    def build_page(self, index: int):
+        """Create a stage's page, showing its default values."""
+        spec = self.stages[index]
+        page = QWidget()
+        self.layout = QVBoxLayout(page)
+        self.layout.setSpacing(12)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.widgets = {}
+        
+        self.add_section_header(spec.header)
+        for param in spec.params:
+            self.add_param(param, spec.defaults.get(param.attr))
+        self.add_stretch()
+        
+        self.stack.addWidget(page)
+        self.pages[index] = self.widgets
+        self.page_widgets[index] = page
+    
+    def show_page(self, index: int):
+        """Show a stage's page and make its widgets the active map."""
+        if self.pages[index] is None:
+            self.build_page(index)
+        page = self.page_widgets[index]
+        # Size the stack to the shown page, not the tallest one
+        for i in range(self.stack.count()):
+            widget = self.stack.widget(i)
+            policy = QSizePolicy.Policy.Preferred if widget is page else QSizePolicy.Policy.Ignored
+            widget.setSizePolicy(policy, policy)
+        self.stack.setCurrentWidget(page)
+        self.widgets = self.pages[index]
+    
+    def show_metadata(self, metadata: RawMetadata):
+        """Show metadata above the stage pages, replacing any previous display."""
+        if self.metadata_group is not None:
+            self.outer_layout.removeWidget(self.metadata_group)
+            self.metadata_group.deleteLater()
+            self.metadata_group = None
+        if not metadata.sensor_name:
+            return
+        
         group = QGroupBox("Parsed Metadata")
         grid = QGridLayout(group)
         grid.setSpacing(8)
@@ -730,7 +1758,8 @@ class ParameterPanel(QScrollArea):
             grid.addWidget(key_label, i // 2, (i % 2) * 2)
             grid.addWidget(value_label, i // 2, (i % 2) * 2 + 1)
         
-        self.layout.addWidget(group)
+        self.outer_layout.insertWidget(0, group)
+        self.metadata_group = group
     
     def add_spin_param(self, label: str, key: str, value: int, 
                        min_val: int = 0, max_val: int = 1023) -> QSpinBox:
@@ -790,18 +1819,24 @@ class ParameterPanel(QScrollArea):
         
         slider = QSlider(Qt.Orientation.Horizontal)
         slider.setRange(0, 100)
-        slider.setValue(int((value - min_val) / (max_val - min_val) * 100))
+        slider.setValue(self._slider_position(value, min_val, max_val))
+        # valueChanged only fires on release (or a key/page step), not per drag pixel
+        slider.setTracking(False)
         
         def update_label(v):
             actual = min_val + (v / 100) * (max_val - min_val)
             value_lbl.setText(f"{actual:.2f}")
         
+        # Dragging only updates the label; the pipeline runs once on release
+        slider.sliderMoved.connect(update_label)
         slider.valueChanged.connect(update_label)
+        slider.valueChanged.connect(self.edited)
         container.addWidget(slider)
         
         self.layout.addLayout(container)
         self.widgets[key] = slider
         self.widgets[key + "_range"] = (min_val, max_val)
+        self.widgets[key + "_label"] = value_lbl
         return slider
     
     def add_combo_param(self, label: str, key: str, options: List[str], 
@@ -835,21 +1870,96 @@ class ParameterPanel(QScrollArea):
         """Add a section header."""
         lbl = QLabel(title)
         lbl.setObjectName("sectionLabel")
-        lbl.setStyleSheet("margin-top: 8px;")
+        lbl.setProperty("header", True)
         self.layout.addWidget(lbl)
     
     def add_stretch(self):
         """Add stretch to push content up."""
         self.layout.addStretch()
     
-    def get_slider_value(self, key: str) -> float:
-        """Get actual value from slider."""
+    def add_note(self, text: str):
+        """Add a wrapped block of explanatory text."""
+        note = QLabel(text)
+        note.setObjectName("stageSummary")
+        note.setWordWrap(True)
+        self.layout.addWidget(note)
+    
+    def add_param(self, spec: ParamSpec, value: Any = None):
+        """Add the widget described by spec, showing value."""
+        if spec.kind == "header":
+            self.add_section_header(spec.label)
+        elif spec.kind == "note":
+            self.add_note(spec.label)
+        elif spec.kind == "spin":
+            self.add_spin_param(spec.label, spec.key, value, spec.lo, spec.hi)
+        elif spec.kind == "slider":
+            self.add_slider_param(spec.label, spec.key, value, spec.lo, spec.hi)
+        elif spec.kind == "check":
+            self.add_checkbox_param(spec.label, spec.key, value)
+        elif spec.kind == "combo":
+            self.add_combo_param(spec.label, spec.key, list(spec.lo), value)
+        elif spec.kind == "index_combo":
+            current = spec.lo[value] if 0 <= value < len(spec.lo) else spec.lo[0]
+            self.add_combo_param(spec.label, spec.key, list(spec.lo), current)
+    
+    def set_param(self, spec: ParamSpec, value: Any):
+        """Show value in spec's widget on the active page without emitting edits."""
+        widget = self.widgets.get(spec.key) if spec.key else None
+        if widget is None:
+            return
+        widget.blockSignals(True)
+        try:
+            if spec.kind == "spin":
+                widget.setValue(value)
+            elif spec.kind == "slider":
+                min_val, max_val = self.widgets[spec.key + "_range"]
+                widget.setValue(self._slider_position(value, min_val, max_val))
+                self.widgets[spec.key + "_label"].setText(f"{value:.2f}")
+            elif spec.kind == "check":
+                widget.setChecked(value)
+            elif spec.kind == "combo":
+                widget.setCurrentText(value)
+            elif spec.kind == "index_combo":
+                widget.setCurrentText(spec.lo[value] if 0 <= value < len(spec.lo) else spec.lo[0])
+        finally:
+            widget.blockSignals(False)
+    
+    def read_param(self, spec: ParamSpec, current: Any) -> Any:
+        """Read the value of spec's widget, or current if it has none."""
+        widget = self.widgets.get(spec.key) if spec.key else None
+        if widget is None:
+            return current
+        if spec.kind == "spin":
+            return widget.value()
+        if spec.kind == "slider":
+            return self.get_slider_value(spec.key, current)
+        if spec.kind == "check":
+            return widget.isChecked()
+        if spec.kind == "combo":
+            return widget.currentText()
+        if spec.kind == "index_combo":
+            return spec.hi[widget.currentText()]
+        return current
+    
+    def get_slider_value(self, key: str, current: Optional[float] = None) -> float:
+        """Get actual value from slider.
+        
+        If ``current`` is given and the slider still sits where ``current``
+        placed it, ``current`` is returned unchanged, so an untouched slider
+        doesn't requantize its parameter to the 1% step grid.
+        """
         slider = self.widgets.get(key)
         range_key = key + "_range"
         if slider and range_key in self.widgets:
             min_val, max_val = self.widgets[range_key]
+            if current is not None and slider.value() == self._slider_position(current, min_val, max_val):
+                return current
             return min_val + (slider.value() / 100) * (max_val - min_val)
         return 0.0
+    
+    @staticmethod
+    def _slider_position(value: float, min_val: float, max_val: float) -> int:
+        return int((value - min_val) / (max_val - min_val) * 100)
 
 
 class ISPCarouselApp(QMainWindow):
@@ -863,14 +1973,28 @@ class ISPCarouselApp(QMainWindow):
         self.metadata = RawMetadata()
         self.params = ISPParameters()
         self.processor = ISPProcessor()
-        self.progress_dots = []
+        self.load_task: Optional[RawLoadTask] = None
+        # Bumped on every upload so cache keys never match a previous load, even
+        # of the same path
+        self.load_generation = 0
+        self.metadata_task: Optional[MetadataLoadTask] = None
+        # Scaled preview per slide, dropped on upload, resize and parameter changes
+        self.slide_pixmaps: List[Optional[QPixmap]] = [None] * N_SLIDES
+        # Cache keys of previews currently rendering on the thread pool
+        self.pending_renders: Dict[str, StageRenderTask] = {}
+        # Coalesces bursts of parameter changes into a single re-render
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.update_image_display)
+        # Built once and reused so each upload reopens the same dialog
+        self._open_dialog = QFileDialog(self)
+        self._open_dialog.setFileMode(QFileDialog.FileMode.ExistingFile)
         
         self.init_ui()
         
     def init_ui(self):
         self.setWindowTitle("ISP Pipeline - Photo Processor")
         self.setMinimumSize(1200, 800)
-        self.setStyleSheet(CLEAN_STYLE)
         
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -909,7 +2033,7 @@ class ISPCarouselApp(QMainWindow):
         slide_header = QHBoxLayout()
         self.slide_title = QLabel(SLIDE_TITLES[0])
         self.slide_title.setObjectName("slideTitle")
-        self.slide_counter = QLabel("1 of 10")
+        self.slide_counter = QLabel(SLIDE_COUNTERS[0])
         self.slide_counter.setObjectName("slideCounter")
         slide_header.addWidget(self.slide_title)
         slide_header.addStretch()
@@ -928,10 +2052,16 @@ class ISPCarouselApp(QMainWindow):
         self.image_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         content_layout.addWidget(self.image_label, stretch=3)
         
+        # Status messages are rendered once and blitted on every miss
+        self.loading_pixmap = self.create_placeholder_pixmap("Loading...")
+        self.processing_pixmap = self.create_placeholder_pixmap("Processing...")
+        
         # Parameter panel
         self.param_panel = ParameterPanel()
         self.param_panel.setMinimumWidth(320)
         self.param_panel.setMaximumWidth(380)
+        self.param_panel.set_stages(STAGES)
+        self.param_panel.edited.connect(self.apply_current_stage)
         content_layout.addWidget(self.param_panel, stretch=2)
         
         main_layout.addLayout(content_layout, stretch=1)
@@ -967,27 +2097,15 @@ class ISPCarouselApp(QMainWindow):
         progress_container.setSpacing(8)
         progress_container.addStretch()
         
-        for i in range(10):
-            dot = QFrame()
-            dot.setObjectName("progressDot")
-            dot.setFixedSize(8, 8)
-            dot.setStyleSheet("background-color: #228be6; border-radius: 4px;" if i == 0 else "background-color: #dee2e6; border-radius: 4px;")
-            self.progress_dots.append(dot)
-            progress_container.addWidget(dot)
+        self.progress_dots = ProgressDots(N_SLIDES)
+        progress_container.addWidget(self.progress_dots)
         
         progress_container.addStretch()
         
         self.next_btn = QPushButton("Next →")
         self.next_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.next_btn.clicked.connect(self.next_slide)
-        self.next_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #228be6; color: white; border: none;
-                border-radius: 6px; padding: 12px 32px; font-size: 14px; font-weight: 500;
-            }
-            QPushButton:hover { background-color: #1c7ed6; }
-            QPushButton:disabled { background-color: #adb5bd; }
-        """)
+        self.next_btn.setObjectName("primaryButton")
         
         nav_layout.addWidget(self.prev_btn)
         nav_layout.addLayout(progress_container, stretch=1)
@@ -995,9 +2113,28 @@ class ISPCarouselApp(QMainWindow):
         
         main_layout.addLayout(nav_layout)
         
+        # Keyboard navigation; plain arrows stay with the focused slider or spinbox
+        QShortcut(QKeySequence("Alt+Left"), self, activated=self.prev_slide)
+        QShortcut(QKeySequence("Alt+Right"), self, activated=self.next_slide)
+        
         # Initialize first slide
         self.update_parameter_panel()
     
+    def create_placeholder_pixmap(self, text: str) -> QPixmap:
+        """Render a status message for the image label into a pixmap."""
+        width, height = 240, 40
+        # Rendered in device pixels so the text stays sharp on HiDPI screens
+        dpr = self.image_label.devicePixelRatioF()
+        pixmap = QPixmap(round(width * dpr), round(height * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        painter.setFont(self.image_label.font())
+        painter.setPen(QColor("#868e96"))
+        painter.drawText(0, 0, width, height, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        return pixmap
+    
     def create_upload_card(self, title, formats, callback, card_type):
         """Create upload card."""
         card = QFrame()
@@ -1038,322 +2175,266 @@ class ISPCarouselApp(QMainWindow):
         
         return card
     
+    def choose_file(self, title: str, name_filter: str) -> str:
+        """Ask for an existing file with the shared dialog; empty if cancelled."""
+        self._open_dialog.setWindowTitle(title)
+        self._open_dialog.setNameFilter(name_filter)
+        if not self._open_dialog.exec():
+            return ""
+        files = self._open_dialog.selectedFiles()
+        return files[0] if files else ""
+    
+    def show_filename(self, label: QLabel, filename: str):
+        """Show a selected file name in an upload card, elided to fit."""
+        label.setProperty("selected", True)
+        repolish(label)
+        # Measure after repolish so the selected style's font is used
+        label.setText(label.fontMetrics().elidedText(
+            filename, Qt.TextElideMode.ElideMiddle, FILENAME_ELIDE_PX))
+        label.setToolTip(filename)
+    
     def upload_photo(self):
         """Handle photo upload."""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select RAW Image", "",
+        file_path = self.choose_file(
+            "Select RAW Image",
             "RAW Images (*.raw *.cr2 *.nef *.arw *.dng *.orf *.rw2);;All Files (*.*)"
         )
         
         if file_path:
             self.photo_path = file_path
-            filename = Path(file_path).name
-            self.photo_filename.setText(filename[:35] + "..." if len(filename) > 35 else filename)
-            self.photo_filename.setStyleSheet("color: #228be6; font-size: 13px;")
+            self.load_generation += 1
+            self.show_filename(self.photo_filename, Path(file_path).name)
             
-            # Load and process
-            self.processor.load_raw(file_path, self.params)
-            self.update_image_display()
+            # Load off the GUI thread; on_raw_loaded picks up the result. Renders
+            # still running for the old photo finish under stale keys and are dropped
+            QPixmapCache.clear()
+            self.pending_renders.clear()
+            self.invalidate_slide_pixmaps()
+            self.processor.raw_data = None
+            self.image_label.setPixmap(self.loading_pixmap)
+            
+            self.load_task = RawLoadTask(self.processor, file_path, copy.copy(self.params),
+                                         self.load_generation)
+            self.load_task.signals.finished.connect(self.on_raw_loaded)
+            QThreadPool.globalInstance().start(self.load_task)
+    
+    def on_raw_loaded(self, generation: int, file_path: str, raw: np.ndarray,
+                      pattern: Optional[int]):
+        """Install a RAW decoded by RawLoadTask and show the current stage."""
+        if generation != self.load_generation:
+            # A newer upload superseded this one, possibly of the same path
+            return
+        self.load_task = None
+        self.processor.raw_data = raw
+        if pattern is not None and pattern != self.params.bayer_pattern:
+            # Camera RAW files carry their own layout; it overrides the panel
+            self.params.bayer_pattern = pattern
+            self.update_parameter_panel()
+        self.update_image_display()
+        self.prefetch_neighbors()
     
     def upload_txt(self):
         """Handle metadata file upload."""
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Select Metadata File", "",
+        file_path = self.choose_file(
+            "Select Metadata File",
             "Text Files (*.txt);;All Files (*.*)"
         )
         
         if file_path:
             self.txt_path = file_path
-            filename = Path(file_path).name
-            self.txt_filename.setText(filename[:35] + "..." if len(filename) > 35 else filename)
-            self.txt_filename.setStyleSheet("color: #228be6; font-size: 13px;")
+            self.show_filename(self.txt_filename, Path(file_path).name)
             
-            # Parse metadata
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                self.metadata = MetadataParser.parse(content)
-                
-                # Update ISP params from metadata
-                self.params.bpp = self.metadata.bpp
-                self.params.bayer_pattern = self.metadata.bayer_type
-                self.params.packed = bool(self.metadata.packed)
-                
-                # Refresh panel
-                self.update_parameter_panel()
-                
-            except Exception as e:
-                print(f"Error parsing metadata: {e}")
+            # Parse off the GUI thread; on_metadata_loaded applies the result
+            self.metadata_task = MetadataLoadTask(file_path)
+            self.metadata_task.signals.finished.connect(self.on_metadata_loaded)
+            QThreadPool.globalInstance().start(self.metadata_task)
     
-    def update_parameter_panel(self):
-        """Update parameter panel for current slide."""
-        self.param_panel.clear()
+    def on_metadata_loaded(self, file_path: str, metadata: RawMetadata):
+        """Apply metadata parsed by MetadataLoadTask."""
+        if file_path != self.txt_path:
+            return
+        self.metadata_task = None
+        self.metadata = metadata
         
-        # Add metadata if available
-        if self.metadata.sensor_name:
-            self.param_panel.add_metadata_display(self.metadata)
+        # Update ISP params from metadata
+        self.params.bpp = self.metadata.bpp
+        self.params.bayer_pattern = self.metadata.bayer_type
+        self.params.packed = bool(self.metadata.packed)
+        self.invalidate_slide_pixmaps()
         
+        # Refresh panel
+        self.param_panel.show_metadata(self.metadata)
+        self.update_parameter_panel()
+    
+    def update_parameter_panel(self):
+        """Show the current slide's page with values from self.params."""
         stage = self.current_slide
-        
-        if stage == 0:  # Raw Interpretation
-            self.param_panel.add_section_header("RAW FORMAT")
-            self.param_panel.add_spin_param("Width", "width", self.params.width, 1, 10000)
-            self.param_panel.add_spin_param("Height", "height", self.params.height, 1, 10000)
-            self.param_panel.add_spin_param("Bits Per Pixel", "bpp", self.params.bpp, 8, 16)
-            self.param_panel.add_combo_param("Bayer Pattern", "bayer_pattern", 
-                                             ["RGGB", "GRBG", "GBRG", "BGGR"],
-                                             BAYER_PATTERNS.get(self.params.bayer_pattern, "RGGB"))
-            self.param_panel.add_checkbox_param("Packed Format", "packed", self.params.packed)
-            
-        elif stage == 1:  # Black Level
-            self.param_panel.add_section_header("BLACK LEVEL CORRECTION")
-            self.param_panel.add_spin_param("Black Level R", "bl_r", self.params.black_level_r, 0, 1023)
-            self.param_panel.add_spin_param("Black Level Gr", "bl_gr", self.params.black_level_gr, 0, 1023)
-            self.param_panel.add_spin_param("Black Level Gb", "bl_gb", self.params.black_level_gb, 0, 1023)
-            self.param_panel.add_spin_param("Black Level B", "bl_b", self.params.black_level_b, 0, 1023)
-            
-        elif stage == 2:  # Demosaic
-            self.param_panel.add_section_header("DEMOSAICING")
-            self.param_panel.add_combo_param("Method", "demosaic_method",
-                                             ["Bilinear", "VNG", "AHD", "DCB"],
-                                             self.params.demosaic_method)
-            self.param_panel.add_slider_param("Edge Threshold", "edge_threshold", 
-                                              self.params.edge_threshold, 0.0, 1.0)
-            
-        elif stage == 3:  # White Balance
-            self.param_panel.add_section_header("WHITE BALANCE")
-            self.param_panel.add_checkbox_param("Auto White Balance", "auto_wb", self.params.auto_wb)
-            self.param_panel.add_slider_param("R Gain", "wb_r", self.params.wb_r_gain, 0.5, 3.0)
-            self.param_panel.add_slider_param("G Gain", "wb_g", self.params.wb_g_gain, 0.5, 3.0)
-            self.param_panel.add_slider_param("B Gain", "wb_b", self.params.wb_b_gain, 0.5, 3.0)
-            
-        elif stage == 4:  # Lens Shading
-            self.param_panel.add_section_header("LENS SHADING CORRECTION")
-            self.param_panel.add_checkbox_param("Enable LSC", "lsc_enabled", self.params.lsc_enabled)
-            self.param_panel.add_slider_param("Strength", "lsc_strength", self.params.lsc_strength, 0.0, 2.0)
-            self.param_panel.add_slider_param("Center X", "lsc_cx", self.params.lsc_center_x, 0.0, 1.0)
-            self.param_panel.add_slider_param("Center Y", "lsc_cy", self.params.lsc_center_y, 0.0, 1.0)
-            
-        elif stage == 5:  # GTM / LUT
-            self.param_panel.add_section_header("GLOBAL TONE MAPPING")
-            self.param_panel.add_checkbox_param("Enable GTM", "gtm_enabled", self.params.gtm_enabled)
-            self.param_panel.add_slider_param("Strength", "gtm_strength", self.params.gtm_strength, 0.5, 2.0)
-            self.param_panel.add_slider_param("Contrast", "gtm_contrast", self.params.gtm_contrast, 0.5, 2.0)
-            self.param_panel.add_section_header("LUT")
-            # LUT file selector would go here
-            
-        elif stage == 6:  # Exposure
-            self.param_panel.add_section_header("EXPOSURE COMPENSATION")
-            self.param_panel.add_slider_param("EV Adjustment", "exposure_ev", self.params.exposure_ev, -3.0, 3.0)
-            self.param_panel.add_slider_param("Highlight Recovery", "highlight_rec", 
-                                              self.params.highlight_recovery, 0.0, 1.0)
-            self.param_panel.add_slider_param("Shadow Recovery", "shadow_rec",
-                                              self.params.shadow_recovery, 0.0, 1.0)
-            
-        elif stage == 7:  # Gamma
-            self.param_panel.add_section_header("GAMMA CORRECTION")
-            self.param_panel.add_checkbox_param("Enable Gamma", "gamma_enabled", self.params.gamma_enabled)
-            self.param_panel.add_slider_param("Gamma Value", "gamma", self.params.gamma_value, 1.0, 3.0)
-            
-        elif stage == 8:  # Color Correction
-            self.param_panel.add_section_header("COLOR CORRECTION")
-            self.param_panel.add_slider_param("Saturation", "saturation", self.params.saturation, 0.0, 2.0)
-            self.param_panel.add_slider_param("Hue Shift", "hue_shift", self.params.hue_shift, -1.0, 1.0)
-            self.param_panel.add_checkbox_param("Enable CCM", "ccm_enabled", self.params.ccm_enabled)
-            
-        elif stage == 9:  # Output Preview
-            self.param_panel.add_section_header("FINAL OUTPUT")
-            # Summary of all applied settings
-            summary = QLabel("All ISP stages applied.\nImage ready for export.")
-            summary.setStyleSheet("color: #495057; font-size: 13px; padding: 12px;")
-            summary.setWordWrap(True)
-            self.param_panel.layout.addWidget(summary)
-        
-        self.param_panel.add_stretch()
+        self.param_panel.show_page(stage)
+        for param in STAGES[stage].params:
+            if param.attr:
+                self.param_panel.set_param(param, getattr(self.params, param.attr))
     
     def apply_current_stage(self):
         """Apply current stage parameters."""
         stage = self.current_slide
+        before = copy.copy(self.params)
         
         # Read values from panel
-        widgets = self.param_panel.widgets
-        
-        if stage == 0:
-            if "width" in widgets:
-                self.params.width = widgets["width"].value()
-            if "height" in widgets:
-                self.params.height = widgets["height"].value()
-            if "bpp" in widgets:
-                self.params.bpp = widgets["bpp"].value()
-            if "bayer_pattern" in widgets:
-                pattern = widgets["bayer_pattern"].currentText()
-                self.params.bayer_pattern = list(BAYER_PATTERNS.values()).index(pattern)
-            if "packed" in widgets:
-                self.params.packed = widgets["packed"].isChecked()
-                
-        elif stage == 1:
-            if "bl_r" in widgets:
-                self.params.black_level_r = widgets["bl_r"].value()
-            if "bl_gr" in widgets:
-                self.params.black_level_gr = widgets["bl_gr"].value()
-            if "bl_gb" in widgets:
-                self.params.black_level_gb = widgets["bl_gb"].value()
-            if "bl_b" in widgets:
-                self.params.black_level_b = widgets["bl_b"].value()
-                
-        elif stage == 2:
-            if "demosaic_method" in widgets:
-                self.params.demosaic_method = widgets["demosaic_method"].currentText()
-            if "edge_threshold" in widgets:
-                self.params.edge_threshold = self.param_panel.get_slider_value("edge_threshold")
-                
-        elif stage == 3:
-            if "auto_wb" in widgets:
-                self.params.auto_wb = widgets["auto_wb"].isChecked()
-            if "wb_r" in widgets:
-                self.params.wb_r_gain = self.param_panel.get_slider_value("wb_r")
-            if "wb_g" in widgets:
-                self.params.wb_g_gain = self.param_panel.get_slider_value("wb_g")
-            if "wb_b" in widgets:
-                self.params.wb_b_gain = self.param_panel.get_slider_value("wb_b")
-                
-        elif stage == 4:
-            if "lsc_enabled" in widgets:
-                self.params.lsc_enabled = widgets["lsc_enabled"].isChecked()
-            if "lsc_strength" in widgets:
-                self.params.lsc_strength = self.param_panel.get_slider_value("lsc_strength")
-            if "lsc_cx" in widgets:
-                self.params.lsc_center_x = self.param_panel.get_slider_value("lsc_cx")
-            if "lsc_cy" in widgets:
-                self.params.lsc_center_y = self.param_panel.get_slider_value("lsc_cy")
-                
-        elif stage == 5:
-            if "gtm_enabled" in widgets:
-                self.params.gtm_enabled = widgets["gtm_enabled"].isChecked()
-            if "gtm_strength" in widgets:
-                self.params.gtm_strength = self.param_panel.get_slider_value("gtm_strength")
-            if "gtm_contrast" in widgets:
-                self.params.gtm_contrast = self.param_panel.get_slider_value("gtm_contrast")
-                
-        elif stage == 6:
-            if "exposure_ev" in widgets:
-                self.params.exposure_ev = self.param_panel.get_slider_value("exposure_ev")
-            if "highlight_rec" in widgets:
-                self.params.highlight_recovery = self.param_panel.get_slider_value("highlight_rec")
-            if "shadow_rec" in widgets:
-                self.params.shadow_recovery = self.param_panel.get_slider_value("shadow_rec")
-                
-        elif stage == 7:
-            if "gamma_enabled" in widgets:
-                self.params.gamma_enabled = widgets["gamma_enabled"].isChecked()
-            if "gamma" in widgets:
-                self.params.gamma_value = self.param_panel.get_slider_value("gamma")
-                
-        elif stage == 8:
-            if "saturation" in widgets:
-                self.params.saturation = self.param_panel.get_slider_value("saturation")
-            if "hue_shift" in widgets:
-                self.params.hue_shift = self.param_panel.get_slider_value("hue_shift")
-            if "ccm_enabled" in widgets:
-                self.params.ccm_enabled = widgets["ccm_enabled"].isChecked()
+        for param in STAGES[stage].params:
+            if param.attr:
+                current = getattr(self.params, param.attr)
+                setattr(self.params, param.attr, self.param_panel.read_param(param, current))
+        
+        start = self.first_changed_stage(before)
+        if start is None:
+            # Nothing was edited (e.g. plain navigation); keep the previews
+            return
         
-        self.update_image_display()
+        self.invalidate_slide_pixmaps(start)
+        self.schedule_refresh()
     
     def reset_current_stage(self):
         """Reset current stage to defaults."""
         stage = self.current_slide
+        before = copy.copy(self.params)
         
-        if stage == 0:
-            self.params.width = 4000
-            self.params.height = 3000
-            self.params.bpp = 10
-            self.params.bayer_pattern = 0
-            self.params.packed = False
-        elif stage == 1:
-            self.params.black_level_r = 64
-            self.params.black_level_gr = 64
-            self.params.black_level_gb = 64
-            self.params.black_level_b = 64
-        elif stage == 2:
-            self.params.demosaic_method = "Bilinear"
-            self.params.edge_threshold = 0.1
-        elif stage == 3:
-            self.params.wb_r_gain = 1.0
-            self.params.wb_g_gain = 1.0
-            self.params.wb_b_gain = 1.0
-            self.params.auto_wb = False
-        elif stage == 4:
-            self.params.lsc_enabled = True
-            self.params.lsc_strength = 1.0
-            self.params.lsc_center_x = 0.5
-            self.params.lsc_center_y = 0.5
-        elif stage == 5:
-            self.params.gtm_enabled = True
-            self.params.gtm_strength = 1.0
-            self.params.gtm_contrast = 1.0
-        elif stage == 6:
-            self.params.exposure_ev = 0.0
-            self.params.highlight_recovery = 0.0
-            self.params.shadow_recovery = 0.0
-        elif stage == 7:
-            self.params.gamma_enabled = True
-            self.params.gamma_value = 2.2
-        elif stage == 8:
-            self.params.saturation = 1.0
-            self.params.hue_shift = 0.0
-            self.params.ccm_enabled = False
+        for attr, value in STAGES[stage].defaults.items():
+            setattr(self.params, attr, value)
         
         self.update_parameter_panel()
-        self.update_image_display()
+        start = self.first_changed_stage(before)
+        if start is not None:
+            self.invalidate_slide_pixmaps(start)
+            self.schedule_refresh()
+    
+    def first_changed_stage(self, before: ISPParameters) -> Optional[int]:
+        """Return the earliest stage whose output differs from before, or None."""
+        changed = [FIELD_STAGE.get(name, 0) for name in vars(before)
+                   if getattr(self.params, name) != getattr(before, name)]
+        return min(changed, default=None)
+    
+    def schedule_refresh(self):
+        """Re-render the current stage once changes stop arriving for REFRESH_DEBOUNCE_MS."""
+        # Restarting the timer drops the pending refresh instead of queuing another
+        self._refresh_timer.start(REFRESH_DEBOUNCE_MS)
     
     def update_image_display(self):
         """Update image with current ISP stage processing."""
         if self.processor.raw_data is None:
             return
         
-        try:
-            # Process up to current stage
-            processed = self.processor.process_stage(self.current_slide, self.params)
-            
-            # Convert to QImage
-            qimage = self.processor.to_qimage(processed)
-            
-            if not qimage.isNull():
-                pixmap = QPixmap.fromImage(qimage)
-                scaled = pixmap.scaled(
-                    self.image_label.width() - 20,
-                    self.image_label.height() - 20,
-                    Qt.AspectRatioMode.KeepAspectRatio,
-                    Qt.TransformationMode.SmoothTransformation
-                )
-                self.image_label.setPixmap(scaled)
-            else:
-                self.image_label.setText("Processing...")
-                
-        except Exception as e:
-            self.image_label.setText(f"Error: {str(e)[:50]}")
-    
-    def update_progress_dots(self):
-        """Update progress indicators."""
-        for i, dot in enumerate(self.progress_dots):
-            if i == self.current_slide:
-                dot.setStyleSheet("background-color: #228be6; border-radius: 4px;")
-            elif i < self.current_slide:
-                dot.setStyleSheet("background-color: #40c057; border-radius: 4px;")
-            else:
-                dot.setStyleSheet("background-color: #dee2e6; border-radius: 4px;")
+        stage = self.current_slide
+        if self.slide_pixmaps[stage] is not None:
+            self.image_label.setPixmap(self.slide_pixmaps[stage])
+            return
+        
+        _, target_w, target_h = self.display_target_size()
+        
+        # Revisiting a stage with unchanged parameters hits the cache
+        key = self.display_cache_key(stage, target_w, target_h)
+        cached = QPixmapCache.find(key)
+        if cached is not None:
+            self.slide_pixmaps[stage] = cached
+            self.image_label.setPixmap(cached)
+            return
+        
+        # Render on the thread pool so the UI stays responsive; on_stage_rendered
+        # shows the result (a prefetch may already be producing it)
+        self.image_label.setPixmap(self.processing_pixmap)
+        if key not in self.pending_renders:
+            self.start_render(stage, key, target_w, target_h, priority=1)
+    
+    def start_render(self, stage: int, key: str, width: int, height: int, priority: int = 0):
+        """Queue a StageRenderTask for a stage preview under the current parameters."""
+        # The task keeps the mosaic it was started with, so a later upload cannot
+        # swap it (or None) in mid-render
+        raw = self.processor.raw_data
+        if raw is None:
+            return
+        task = StageRenderTask(self.processor, stage, copy.copy(self.params), raw,
+                               width, height, key)
+        task.signals.finished.connect(self.on_stage_rendered)
+        self.pending_renders[key] = task
+        QThreadPool.globalInstance().start(task, priority)
+    
+    def store_preview(self, stage: int, key: str, image: QImage, dpr: float) -> QPixmap:
+        """Convert a scaled stage image to a pixmap and memoize it."""
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+        QPixmapCache.insert(key, pixmap)
+        self.slide_pixmaps[stage] = pixmap
+        return pixmap
+    
+    def prefetch_neighbors(self):
+        """Render the previews for the adjacent slides on the thread pool."""
+        if self.processor.raw_data is None:
+            return
+        
+        _, target_w, target_h = self.display_target_size()
+        for stage in (self.current_slide - 1, self.current_slide + 1):
+            if not 0 <= stage < N_SLIDES or self.slide_pixmaps[stage] is not None:
+                continue
+            key = self.display_cache_key(stage, target_w, target_h)
+            if key in self.pending_renders or QPixmapCache.find(key) is not None:
+                continue
+            self.start_render(stage, key, target_w, target_h)
+    
+    def on_stage_rendered(self, stage: int, key: str, image: QImage):
+        """Store a preview produced by StageRenderTask if it is still current."""
+        self.pending_renders.pop(key, None)
+        dpr, target_w, target_h = self.display_target_size()
+        if key != self.display_cache_key(stage, target_w, target_h):
+            # Parameters, photo or label size changed while rendering
+            if stage == self.current_slide:
+                self.update_image_display()
+            return
+        
+        if image.isNull():
+            if stage == self.current_slide:
+                self.image_label.setText(f"Error: could not render {SLIDE_TITLES[stage]}")
+            return
+        
+        pixmap = self.store_preview(stage, key, image, dpr)
+        if stage == self.current_slide:
+            self.image_label.setPixmap(pixmap)
+    
+    def display_target_size(self):
+        """Return the device pixel ratio and device-pixel size of the preview area."""
+        # Scale straight to device pixels so HiDPI paints are a 1:1 blit
+        dpr = self.image_label.devicePixelRatioF()
+        return (dpr,
+                int((self.image_label.width() - 20) * dpr),
+                int((self.image_label.height() - 20) * dpr))
+    
+    def invalidate_slide_pixmaps(self, start: int = 0):
+        """Drop memoized previews for slide `start` and every later stage."""
+        for i in range(start, len(self.slide_pixmaps)):
+            self.slide_pixmaps[i] = None
+    
+    def display_cache_key(self, stage: int, width: int, height: int) -> str:
+        """Build the pixmap cache key for a stage under the current parameters."""
+        # Only the fields the stage depends on, so edits downstream keep its previews
+        deps = tuple(getattr(self.params, name) for name in STAGE_DEPS[stage])
+        return f"{self.photo_path}#{self.load_generation}@{stage}:{hash(deps)}@{width}x{height}"
     
     def update_slide(self):
         """Update current slide display."""
-        self.slide_title.setText(SLIDE_TITLES[self.current_slide])
-        self.slide_counter.setText(f"{self.current_slide + 1} of 10")
-        
-        self.prev_btn.setEnabled(self.current_slide > 0)
-        self.next_btn.setEnabled(self.current_slide < 9)
+        # Coalesce the per-widget repaints below into a single paint
+        self.setUpdatesEnabled(False)
+        try:
+            self.slide_title.setText(SLIDE_TITLES[self.current_slide])
+            self.slide_counter.setText(SLIDE_COUNTERS[self.current_slide])
+            
+            self.prev_btn.setEnabled(self.current_slide > 0)
+            self.next_btn.setEnabled(self.current_slide < N_SLIDES - 1)
+            
+            self.progress_dots.set_current(self.current_slide)
+            self.update_parameter_panel()
+            self.update_image_display()
+        finally:
+            self.setUpdatesEnabled(True)
         
-        self.update_progress_dots()
-        self.update_parameter_panel()
-        self.update_image_display()
+        self.prefetch_neighbors()
     
     def prev_slide(self):
         """Go to previous slide."""
@@ -1364,7 +2445,7 @@ class ISPCarouselApp(QMainWindow):
     
     def next_slide(self):
         """Go to next slide."""
-        if self.current_slide < 9:
+        if self.current_slide < N_SLIDES - 1:
             self.apply_current_stage()
             self.current_slide += 1
             self.update_slide()
@@ -1372,13 +2453,29 @@ class ISPCarouselApp(QMainWindow):
     def resizeEvent(self, event):
         """Handle window resize."""
         super().resizeEvent(event)
-        if self.processor.raw_data is not None:
-            QTimer.singleShot(100, self.update_image_display)
+        shown = self.slide_pixmaps[self.current_slide]
+        self.invalidate_slide_pixmaps()
+        if self.processor.raw_data is None:
+            return
+        
+        if shown is not None:
+            # Stretch the shown preview with a cheap resample while the resize is
+            # in progress; the debounced render replaces it with a smooth one
+            dpr, target_w, target_h = self.display_target_size()
+            if target_w > 0 and target_h > 0:
+                interim = shown.scaled(target_w, target_h,
+                                       Qt.AspectRatioMode.KeepAspectRatio,
+                                       Qt.TransformationMode.FastTransformation)
+                interim.setDevicePixelRatio(dpr)
+                self.image_label.setPixmap(interim)
+        self.schedule_refresh()
 
 
 def main():
     app = QApplication(sys.argv)
     app.setStyle("Fusion")
+    app.setStyleSheet(CLEAN_STYLE)
+    QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
     
     palette = QPalette()
     palette.setColor(QPalette.ColorRole.Window, QColor(255, 255, 255))
@@ -0,0 +1,63 @@
+"""The gamma lookup table must track np.power across the whole input range."""
+
+import unittest
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import PyQt6
+except ImportError:
+    PyQt6 = None
+
+# Largest allowed deviation from np.power, as a fraction of full scale
+# (a quarter of an 8-bit level)
+MAX_GAMMA_ERROR = 0.25 / 255
+
+
+@unittest.skipIf(numba is None or PyQt6 is None, "needs numba and PyQt6")
+class GammaLutTest(unittest.TestCase):
+    def setUp(self):
+        import main
+        self.main = main
+        self.processor = main.ISPProcessor()
+
+    def test_lut_matches_power(self):
+        for max_val in (1.0, 1023.0, 65535.0):
+            # Uniform over [0, max] plus log-spaced samples down into the shadows
+            x = np.concatenate([np.linspace(0.0, max_val, 1_000_001),
+                                np.geomspace(1e-9 * max_val, max_val, 100_001)])
+            x = x.astype(np.float32)
+            for gamma in (1.0, 1.8, 2.2, 2.6, 3.0):
+                with self.subTest(max_val=max_val, gamma=gamma):
+                    got = self.processor._gamma_from_lut(x, max_val, gamma, 1.0)
+                    expected = np.power(x.astype(np.float64) / max_val, 1.0 / gamma)
+                    self.assertLess(np.abs(got - expected).max(), MAX_GAMMA_ERROR)
+
+    def test_fused_chain_matches_numpy(self):
+        main = self.main
+        raw = np.random.default_rng(0).integers(0, 1024, (200, 300), dtype=np.uint16)
+        raw[:50] //= 64
+        params = main.ISPParameters(wb_r_gain=1.7, wb_b_gain=0.6, gamma_value=3.0)
+        self.processor.raw_data = raw
+        fused = self.processor.process_stage(main.N_SLIDES - 1, params)
+
+        # Without the kernels the pipeline falls back to np.power
+        saved = main._tonal_chain_nb, main._apply_lut_nb
+        main._tonal_chain_nb = main._apply_lut_nb = None
+        try:
+            reference = main.ISPProcessor()
+            reference.raw_data = raw
+            expected = reference.process_stage(main.N_SLIDES - 1, params)
+        finally:
+            main._tonal_chain_nb, main._apply_lut_nb = saved
+        error = np.abs(fused.astype(np.float64) - expected).max() / expected.max()
+        self.assertLess(error, MAX_GAMMA_ERROR)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""The app process must exit after numba kernels have run on pool workers."""
+
+import os
+import subprocess
+import sys
+import textwrap
+import unittest
+from pathlib import Path
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    import PyQt6
+except ImportError:
+    PyQt6 = None
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Renders the last stage on the global pool, so the LSC, tonal-chain and gamma-LUT
+# kernels all launch off the main thread, then returns from the script
+WORKER_RENDER_SCRIPT = textwrap.dedent("""
+    import numpy as np
+    from PyQt6.QtCore import QThreadPool
+    from PyQt6.QtWidgets import QApplication
+    import main
+
+    app = QApplication([])
+    processor = main.ISPProcessor()
+    # No kernel may run on the main thread first: the hang needs the threading
+    # layer to start up on a worker
+    raw = np.random.default_rng(0).integers(0, 1024, (192, 256), dtype=np.uint16)
+    results = []
+    task = main.StageRenderTask(processor, main.N_SLIDES - 1, main.ISPParameters(),
+                                raw, 128, 96, "exit-test")
+    task.signals.finished.connect(lambda stage, key, image: results.append(image))
+    QThreadPool.globalInstance().start(task)
+    QThreadPool.globalInstance().waitForDone()
+    app.processEvents()
+    assert results and not results[0].isNull()
+    print("rendered", main.numba.threading_layer() if main.numba else None)
+""")
+
+
+@unittest.skipIf(numba is None or PyQt6 is None, "needs numba and PyQt6")
+class WorkerExitTest(unittest.TestCase):
+    def test_exits_after_worker_render(self):
+        env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+        env.pop("NUMBA_THREADING_LAYER", None)
+        try:
+            proc = subprocess.run([sys.executable, "-c", WORKER_RENDER_SCRIPT],
+                                  cwd=REPO_ROOT, env=env, capture_output=True,
+                                  text=True, timeout=300)
+        except subprocess.TimeoutExpired:
+            self.fail("process did not exit after a worker-thread render")
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+        self.assertIn("rendered", proc.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()